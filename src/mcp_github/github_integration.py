@@ -21,10 +21,18 @@ from __future__ import annotations
 import asyncio
 import logging
 import math
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Coroutine, Iterable, Mapping
 from contextlib import asynccontextmanager
+from copy import deepcopy
 from datetime import UTC, datetime, timedelta
+from functools import reduce
+from importlib.util import find_spec
 from os import getenv
-from typing import Annotated, Any, Literal, TypedDict
+from types import MappingProxyType
+from typing import Annotated, Any, Literal, NoReturn, TypedDict
 
 import httpx
 from fastmcp import Context
@@ -73,6 +81,12 @@ class CommentData(TypedDict):
     created_at: str
 
 
+class InlineComment(TypedDict):
+    path: str
+    line: int
+    body: str
+
+
 class IssueData(TypedDict):
     number: int
     title: str
@@ -137,9 +151,63 @@ GITHUB_TOKEN = getenv("GITHUB_TOKEN")
 TIMEOUT = int(getenv("GITHUB_API_TIMEOUT", "5"))  # seconds, configurable via env
 MAX_STATUS_CHECKS_SUITE_PAGES = 5  # 50 suites per page × 5 = 250 suite ceiling
 MAX_STATUS_CHECKS_RUN_PAGES_PER_SUITE = 5  # 100 runs per page × 5 = 500 run ceiling per suite
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60)
+HTTP_RETRIES = 3  # transport-level retries on connection failures
+THROTTLE_RETRIES = 3  # resends after a secondary rate limit (429, or 403 with Retry-After)
+THROTTLE_MAX_WAIT = 60  # seconds; a longer Retry-After is reported to the caller instead of awaited
+TRANSIENT_RETRIES = 2  # resends of a GET after a 5xx or dropped connection
+TRANSIENT_BACKOFF = (0.25, 4.0)  # seconds; base and cap of the jittered exponential backoff
+_TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+HTTP2 = find_spec("h2") is not None  # multiplex requests over one connection when httpx[http2] is installed
+ETAG_CACHE_SIZE = 512  # conditional-GET entries kept for If-None-Match revalidation
+ETAG_CACHE_MAX_BYTES = 32 * 1024 * 1024  # total body bytes held; bodies over a quarter of this are not cached
+LIST_CACHE_TTL = 30  # seconds a list_open_issues_prs result is reused; any write clears it
+LIST_CACHE_SIZE = 64
+STARS_SCAN_CONCURRENCY = 5  # repos whose stargazers are paged through at once
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.WARNING)
+
+
+def _rate_limit_resource(url: str) -> str:
+    """The X-RateLimit-Resource bucket a REST request to url is counted against."""
+    if "/search/code" in url:
+        return "code_search"
+    if "/search/" in url:
+        return "search"
+    return "core"
+
+
+def _throttle_delay(response: httpx.Response, attempt: int) -> float | None:
+    """Seconds to wait before resending a secondary-rate-limited request, or None to give up."""
+    if response.status_code not in {403, 429}:
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        if not retry_after.isdigit():
+            return None
+        delay = int(retry_after)
+    elif response.status_code == 429 and response.headers.get("X-RateLimit-Remaining") != "0":
+        delay = 2**attempt
+    else:
+        return None
+    # Jitter so concurrent callers throttled together do not resend in lockstep
+    return delay + random.uniform(0, 1) if delay <= THROTTLE_MAX_WAIT else None
+
+
+def _transient_delay(failures: int) -> float:
+    """Jittered exponential backoff before resending after a transient failure."""
+    base, cap = TRANSIENT_BACKOFF
+    return min(cap, base * 2**failures) * random.uniform(0.5, 1.5)
+
+
+async def _all_or_cancel[T](coros: Iterable[Coroutine[Any, Any, T]]) -> list[T]:
+    """Await coros concurrently; the first failure cancels the rest and is raised unwrapped."""
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from None
+    return [task.result() for task in tasks]
 
 
 def _pick(data: dict[str, Any], *keys: str) -> dict[str, Any]:
@@ -267,6 +335,22 @@ _destructive = _annotate(destructive=True)
 
 
 class GitHubIntegration:
+    __slots__ = (
+        "_etag_cache",
+        "_etag_cache_bytes",
+        "_graphql_inflight",
+        "_graphql_waiters",
+        "_headers_by_token",
+        "_http",
+        "_list_cache",
+        "_oauth_mode",
+        "_rate_limit_reset",
+        "_throttled_until",
+        "github_token",
+        "graphql",
+        "verifier",
+    )
+
     def __init__(self):
         """Initialises the GitHubIntegration instance."""
         self.github_token = GITHUB_TOKEN
@@ -282,22 +366,44 @@ class GitHubIntegration:
         self.verifier = APIKeyVerifier(self.github_token) if self.github_token else None
 
         # GraphQL client: token overridden per-call in OAuth2 mode via _resolve_token()
-        self.graphql = GraphQLClient(self.github_token or "", timeout=TIMEOUT)
+        self.graphql = GraphQLClient(
+            self.github_token or "", timeout=TIMEOUT, limits=HTTP_LIMITS, retries=HTTP_RETRIES, http2=HTTP2
+        )
 
-        self._http = httpx.AsyncClient(timeout=TIMEOUT)
+        # One pooled client for every REST call, so keep-alive connections are reused across tools
+        self._http = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(limits=HTTP_LIMITS, retries=HTTP_RETRIES, http2=HTTP2),
+        )
+        # (url, params, accept, authorization) -> (etag, response); 304s are free against the rate limit
+        self._etag_cache: OrderedDict[tuple[str, str, str, str], tuple[str, httpx.Response]] = OrderedDict()
+        self._etag_cache_bytes = 0
+        # Static-token headers are built once; OAuth tokens vary per request so are never memoised
+        self._headers_by_token: dict[str, Mapping[str, str]] = {}
+        # (authorization, *list_open_issues_prs args) -> (expires_at, result)
+        self._list_cache: OrderedDict[tuple[Any, ...], tuple[float, dict[str, Any]]] = OrderedDict()
+        # (Authorization header, X-RateLimit-Resource) -> epoch second the primary limit resets, spent buckets only
+        self._rate_limit_reset: dict[tuple[str, str], int] = {}
+        # Authorization header -> monotonic time before which no request is sent after a secondary rate limit
+        self._throttled_until: dict[str, float] = {}
+        # Concurrent identical GraphQL calls share one request (single-flight)
+        self._graphql_inflight: dict[tuple[str, bool], asyncio.Future[dict[str, Any]]] = {}
+        # Callers awaiting each in-flight key; the request is cancelled when the last one gives up
+        self._graphql_waiters: dict[tuple[str, bool], int] = {}
 
         logger.info("GitHub Integration Initialised")
 
     async def aclose(self) -> None:
-        """Close the shared HTTP client."""
+        """Close the shared REST and GraphQL HTTP clients."""
         await self._http.aclose()
+        await self.graphql.aclose()
 
     async def __aenter__(self) -> GitHubIntegration:
         """Enter async context manager."""
         return self
 
     async def __aexit__(self, *_: Any) -> None:
-        """Exit async context manager and close HTTP client."""
+        """Exit async context manager and close HTTP clients."""
         await self.aclose()
 
     @property
@@ -375,25 +481,164 @@ class GitHubIntegration:
         if not response.is_success:
             self._handle_response_error(response, context)
 
-    def _get_headers(self):
-        """Constructs the HTTP headers required for GitHub API requests."""
+    def _get_headers(self) -> Mapping[str, str]:
+        """Returns the read-only HTTP headers required for GitHub API requests."""
         token = self._resolve_token()
         if not token:
             raise ValueError("GitHub token is missing for API requests")
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
+        headers = self._headers_by_token.get(token)
+        if headers is None:
+            headers = MappingProxyType(
+                {
+                    "Authorization": f"token {token}",
+                    "Accept": "application/vnd.github.v3+json",
+                }
+            )
+            if not self._oauth_mode:
+                self._headers_by_token[token] = headers
         return headers
 
+    def _authorization(self) -> str:
+        """The current request's Authorization header, failing the way _request does when no token resolves."""
+        try:
+            return self._get_headers()["Authorization"]
+        except GitHubAuthError:
+            raise
+        except Exception as e:
+            raise ToolError(str(e)) from e
+
+    async def _send(self, method: str, url: str, headers: Mapping[str, str], **kwargs: Any) -> httpx.Response:
+        """Send a request; GETs are revalidated with If-None-Match and a 304
+        returns the previously fetched response. While the rate limit bucket
+        the request counts against (core, search, ...) is exhausted for the
+        token nothing is sent: cached GETs are served as-is and anything else
+        fails fast with GitHubRateLimitError."""
+        auth = headers.get("Authorization", "")
+        bucket = (auth, _rate_limit_resource(url))
+        exhausted = self._rate_limit_exhausted(bucket)
+        if method.upper() != "GET":
+            if exhausted:
+                self._raise_exhausted(bucket)
+            return await self._dispatch(method, url, headers, auth, **kwargs)
+        key = (url, repr(sorted((kwargs.get("params") or {}).items())), headers.get("Accept", ""), auth)
+        cached = self._etag_cache.get(key)
+        if exhausted:
+            if cached is None:
+                self._raise_exhausted(bucket)
+            return cached[1]
+        if cached is not None:
+            headers = {**headers, "If-None-Match": cached[0]}
+        response = await self._dispatch(method, url, headers, auth, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self._etag_cache.move_to_end(key)
+            return cached[1]
+        etag = response.headers.get("ETag")
+        if etag and response.is_success:
+            self._cache_etag(key, etag, response)
+        return response
+
+    def _cache_etag(self, key: tuple[str, str, str, str], etag: str, response: httpx.Response) -> None:
+        """Keep a response for revalidation, within both the entry and byte budgets."""
+        replaced = self._etag_cache.pop(key, None)
+        if replaced is not None:
+            self._etag_cache_bytes -= len(replaced[1].content)
+        size = len(response.content)
+        if size > ETAG_CACHE_MAX_BYTES // 4:
+            return  # e.g. a multi-MB PR patch: refetching it beats pinning it in memory
+        self._etag_cache[key] = (etag, response)
+        self._etag_cache_bytes += size
+        while len(self._etag_cache) > ETAG_CACHE_SIZE or self._etag_cache_bytes > ETAG_CACHE_MAX_BYTES:
+            _, (_, evicted) = self._etag_cache.popitem(last=False)
+            self._etag_cache_bytes -= len(evicted.content)
+
+    async def _dispatch(
+        self, method: str, url: str, headers: Mapping[str, str], auth: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send one request, waiting out short secondary rate limits before
+        resending. GitHub rejects a throttled request outright, so resending
+        is safe for writes too. The wait is shared per token: once one call
+        is throttled, every other call on that token holds off as well
+        instead of tripping the limit again. GETs are also resent after a
+        5xx or a dropped connection, with jittered backoff."""
+        retry_transient = method.upper() == "GET"
+        attempt = failures = 0
+        while True:
+            await self._await_throttle(auth)
+            try:
+                response = await self._http.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                if not retry_transient or failures >= TRANSIENT_RETRIES:
+                    raise
+                failures += 1
+                logger.warning("%s %s failed (%s); retry %d", method.upper(), url, type(e).__name__, failures)
+                await asyncio.sleep(_transient_delay(failures - 1))
+                continue
+            self._track_rate_limit(auth, url, response)
+            if retry_transient and response.status_code in _TRANSIENT_STATUSES and failures < TRANSIENT_RETRIES:
+                failures += 1
+                logger.warning("%s %s returned %d; retry %d", method.upper(), url, response.status_code, failures)
+                await asyncio.sleep(_transient_delay(failures - 1))
+                continue
+            delay = _throttle_delay(response, attempt)
+            if delay is None:
+                return response
+            until = time.monotonic() + delay
+            self._throttled_until[auth] = max(until, self._throttled_until.get(auth, 0.0))
+            if attempt >= THROTTLE_RETRIES:
+                return response
+            attempt += 1
+            logger.warning(
+                "%s %s throttled (%d); retry %d in %.1fs", method.upper(), url, response.status_code, attempt, delay
+            )
+
+    async def _await_throttle(self, auth: str) -> None:
+        """Sleep until auth's secondary rate limit window, if any, has passed."""
+        until = self._throttled_until.get(auth)
+        if until is None:
+            return
+        wait = until - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        elif self._throttled_until.get(auth) == until:
+            del self._throttled_until[auth]
+
+    def _track_rate_limit(self, auth: str, url: str, response: httpx.Response) -> None:
+        """Remember when a token's primary rate limit bucket resets once GitHub reports it spent."""
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            resource = response.headers.get("X-RateLimit-Resource") or _rate_limit_resource(url)
+            self._rate_limit_reset[auth, resource] = int(reset)
+
+    def _rate_limit_exhausted(self, bucket: tuple[str, str]) -> bool:
+        """True while the bucket's recorded reset time is still in the future."""
+        reset = self._rate_limit_reset.get(bucket)
+        if reset is None:
+            return False
+        if reset > time.time():
+            return True
+        del self._rate_limit_reset[bucket]
+        return False
+
+    def _raise_exhausted(self, bucket: tuple[str, str]) -> NoReturn:
+        """Fail without sending, reporting when the spent bucket resets."""
+        reset = self._rate_limit_reset[bucket]
+        raise GitHubRateLimitError(
+            f"GitHub API {bucket[1]} rate limit exhausted until {datetime.fromtimestamp(reset, UTC):%Y-%m-%dT%H:%M:%SZ}; request not sent.",
+            reset_timestamp=reset,
+        )
+
     async def _request(self, method: str, url: str, *, context: str = "", **kwargs: Any) -> httpx.Response:
         """Make an HTTP request and handle errors."""
         ctx = context or url
-        logger.info(f"{method.upper()} {ctx}")
+        logger.info("%s %s", method.upper(), ctx)
         try:
-            response = await self._http.request(method, url, headers=self._get_headers(), **kwargs)
+            response = await self._send(method, url, self._get_headers(), **kwargs)
             self._raise_for_status(response, context)
-            logger.info(f"Success {method.upper()} {ctx}")
+            if method.upper() != "GET":
+                self._list_cache.clear()
+            logger.info("Success %s %s", method.upper(), ctx)
             return response
         except GitHubAuthError:
             raise
@@ -414,35 +659,61 @@ class GitHubIntegration:
         return _pr_content(data)
 
     @_write
-    async def add_pr_comments(self, repo_owner: str, repo_name: str, pr_number: int, comment: str) -> CommentData:
-        """Adds a comment to a specific pull request."""
-        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues/{pr_number}/comments"
-        data = (await self._request("POST", url, context=f"PR #{pr_number} comment", json={"body": comment})).json()
-        return _comment_result(data)
-
-    @_write
-    async def add_inline_pr_comment(
+    async def add_pr_comments(
         self,
         repo_owner: str,
         repo_name: str,
         pr_number: int,
-        path: str,
-        line: int,
-        comment_body: str,
+        comment: str,
+        path: str | None = None,
+        line: int | None = None,
     ) -> CommentData:
-        """Adds an inline review comment to a specific line in a file within a PR."""
+        """Adds a comment to a specific pull request. Pass path and line to anchor it to that line of the PR head as an inline review comment; omit both for a comment on the PR conversation."""
+        if path is None and line is None:
+            url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues/{pr_number}/comments"
+            data = (await self._request("POST", url, context=f"PR #{pr_number} comment", json={"body": comment})).json()
+            return _comment_result(data)
+        if path is None or line is None:
+            raise ToolError("path and line must be given together for an inline comment")
         pr_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
         pr_data = (await self._request("GET", pr_url, context=f"PR #{pr_number}")).json()
         commit_id = pr_data.get("head", {}).get("sha")
         if not commit_id:
             raise ToolError(f"Could not retrieve head SHA for PR #{pr_number}")
         review_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/comments"
-        payload = {"body": comment_body, "commit_id": commit_id, "path": path, "line": line, "side": "RIGHT"}
+        payload = {"body": comment, "commit_id": commit_id, "path": path, "line": line, "side": "RIGHT"}
         data = (
             await self._request("POST", review_url, context=f"inline comment on {path}:{line}", json=payload)
         ).json()
         return _comment_result(data)
 
+    @_write
+    async def add_inline_pr_comments(
+        self,
+        repo_owner: str,
+        repo_name: str,
+        pr_number: int,
+        comments: list[InlineComment],
+        body: str = "",
+    ) -> dict[str, Any]:
+        """Adds several inline comments to a PR in one request, as a single COMMENT review.
+
+        Each entry needs ``path``, ``line`` and ``body``; comments are anchored to the PR head.
+        ``body`` is an optional summary shown above the inline comments.
+        """
+        if not comments:
+            raise ToolError("At least one inline comment is required")
+        url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}/reviews"
+        payload: dict[str, Any] = {
+            "event": "COMMENT",
+            "comments": [{"path": c["path"], "line": c["line"], "side": "RIGHT", "body": c["body"]} for c in comments],
+        }
+        if body:
+            payload["body"] = body
+        context = f"{len(comments)} inline comments on PR #{pr_number}"
+        data = (await self._request("POST", url, context=context, json=payload)).json()
+        return {**_pick(data, "id", "state", "html_url", "submitted_at"), "comments_posted": len(comments)}
+
     @_write(idempotent=True)
     async def update_pr_description(
         self,
@@ -499,16 +770,20 @@ class GitHubIntegration:
         per_page: Annotated[int, "Number of results per page (1-100)"] = 50,
         page: int = 1,
     ) -> dict[str, Any]:
-        """Lists open pull requests or issues."""
+        """Lists open pull requests or issues. Identical listings are reused for up to 30 seconds; any write tool call clears them."""
         if filtering == "repo":
             if not repo_name:
                 raise ToolError("repo_name is required when filtering='repo'")
             search_target = f"{repo_owner}/{repo_name}"
         else:
             search_target = repo_owner
+        key = (self._authorization(), search_target.lower(), issue, filtering, per_page, page)
+        hit = self._list_cache.get(key)
+        if hit is not None and hit[0] > time.monotonic():
+            return deepcopy(hit[1])
         url = f"https://api.github.com/search/issues?q=is:{issue}+is:open+{filtering}:{search_target}&per_page={per_page}&page={page}"
         data = (await self._request("GET", url, context=f"list open {issue}s for {search_target}")).json()
-        return {
+        result = {
             "total": data["total_count"],
             f"open_{issue}s": [
                 {
@@ -525,6 +800,11 @@ class GitHubIntegration:
                 for item in data["items"]
             ],
         }
+        self._list_cache[key] = (time.monotonic() + LIST_CACHE_TTL, deepcopy(result))
+        self._list_cache.move_to_end(key)
+        while len(self._list_cache) > LIST_CACHE_SIZE:
+            self._list_cache.popitem(last=False)
+        return result
 
     @_write
     async def create_issue(
@@ -637,7 +917,7 @@ class GitHubIntegration:
             "issue_url": data.get("html_url"),
         }
         if missing:
-            logger.warning(f"Some assignees were not applied: {missing}")
+            logger.warning("Some assignees were not applied: %s", missing)
             result["message"] = (
                 f"The following assignees could not be applied (not a collaborator or user does not exist): {sorted(missing)}"
             )
@@ -678,40 +958,60 @@ class GitHubIntegration:
         body: str,
         draft: bool = False,
         prerelease: bool = False,
-        generate_release_notes: bool = True,
+        generate_release_notes: bool | None = None,
         make_latest: Literal["true", "false", "legacy"] = "true",
+        target_commitish: str | None = None,
     ) -> dict[str, Any]:
-        """Creates a new release."""
+        """Creates a new release. If tag_name does not exist yet GitHub creates it from target_commitish (default branch when omitted), so no separate create_tag call is needed. generate_release_notes defaults to True only when body is empty, since GitHub walks the commit history between tags to build them."""
+        if generate_release_notes is None:
+            generate_release_notes = not body
         url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases"
-        data = (
-            await self._request(
-                "POST",
-                url,
-                context=f"create release {release_name}",
-                json={
-                    "tag_name": tag_name,
-                    "name": release_name,
-                    "body": body,
-                    "draft": draft,
-                    "prerelease": prerelease,
-                    "generate_release_notes": generate_release_notes,
-                    "make_latest": make_latest,
-                },
-            )
-        ).json()
+        payload: dict[str, Any] = {
+            "tag_name": tag_name,
+            "name": release_name,
+            "body": body,
+            "draft": draft,
+            "prerelease": prerelease,
+            "generate_release_notes": generate_release_notes,
+            "make_latest": make_latest,
+        }
+        if target_commitish:
+            payload["target_commitish"] = target_commitish
+        data = (await self._request("POST", url, context=f"create release {release_name}", json=payload)).json()
         return _pick(data, "id", "tag_name", "name", "html_url", "draft", "prerelease", "body")
 
     async def _execute_graphql(
-        self, query: str, variables: dict[str, Any], *, token: str | None = None
+        self, query: str, variables: dict[str, Any], *, token: str | None = None, cache: bool = True
     ) -> dict[str, Any]:
-        """Run a GraphQL query off-thread (the client is sync), resolving the
-        request token unless one is supplied."""
-        return await asyncio.to_thread(
-            self.graphql.execute_query,
-            query,
-            variables=variables,
-            token=token or self._resolve_token(),
-        )
+        """Run a GraphQL query, resolving the request token unless one is
+        supplied. cache=False skips the client's result cache for data that
+        must be fresh. Identical calls already in flight are joined rather
+        than re-sent; every caller gets its own copy of the result."""
+        token = token or self._resolve_token()
+        key = (self.graphql._cache.key(query, variables, token), cache)
+        inflight = self._graphql_inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self.graphql.execute_query(query, variables=variables, token=token, cache=cache)
+            )
+            self._graphql_inflight[key] = inflight
+            inflight.add_done_callback(lambda done: self._graphql_settled(key, done))
+        self._graphql_waiters[key] = self._graphql_waiters.get(key, 0) + 1
+        try:
+            # Shielded so one caller's cancellation leaves the request running for the others
+            return deepcopy(await asyncio.shield(inflight))
+        finally:
+            self._graphql_waiters[key] -= 1
+            if not self._graphql_waiters[key]:
+                del self._graphql_waiters[key]
+                inflight.cancel()  # no-op once settled; otherwise nobody is left to use the result
+
+    def _graphql_settled(self, key: tuple[str, bool], done: asyncio.Future[dict[str, Any]]) -> None:
+        """Forget a finished single-flight request and mark its exception retrieved."""
+        if self._graphql_inflight.get(key) is done:
+            del self._graphql_inflight[key]
+        if not done.cancelled():
+            done.exception()
 
     @asynccontextmanager
     async def _guard(self, action: str):
@@ -722,13 +1022,13 @@ class GitHubIntegration:
         except GitHubNotFoundError:
             raise
         except Exception as e:
-            logger.error(f"Error during {action}: {e}")
+            logger.error("Error during %s: %s", action, e)
             raise GitHubAPIError(f"Failed to {action}: {e}") from e
 
     @_read_only(task=True)
     async def search_user(self, username: str) -> UserSearchResult:
         """Search for a GitHub user by username using GraphQL API."""
-        logger.info(f"Searching for GitHub user: {username}")
+        logger.info("Searching for GitHub user: %s", username)
         async with self._guard("search for user"):
             result = await self._execute_graphql(SEARCH_USER_QUERY, {"username": username})
             user_data = result.get("user")
@@ -767,7 +1067,7 @@ class GitHubIntegration:
                     for org in user_data["organizations"]["nodes"]
                 ],
             }
-            logger.info(f"Successfully found user: {username}")
+            logger.info("Successfully found user: %s", username)
             return user_info
 
     def _filtered_contributions(self, collection: dict[str, Any], key: str, org: str, repo: str):
@@ -807,7 +1107,9 @@ class GitHubIntegration:
         ctx: Context | None = None,
     ) -> UserActivityResult:
         """Get user activities with optional filtering by org, repo, and date range using GraphQL API. since/until accept YYYY-MM-DD or full ISO 8601 (YYYY-MM-DDTHH:MM:SSZ). Note: repo_stars returns current cumulative star counts, not stars gained within the requested period — GitHub does not expose per-period star deltas."""
-        logger.info(f"Fetching user activities for {username} (org={org}, repo={repo}, since={since}, until={until})")
+        logger.info(
+            "Fetching user activities for %s (org=%s, repo=%s, since=%s, until=%s)", username, org, repo, since, until
+        )
         async with self._guard("fetch user activities"):
             variables: dict[str, Any] = {"username": username}
             if since:
@@ -866,9 +1168,12 @@ class GitHubIntegration:
                 "repo_stars": repo_stars,
             }
             logger.info(
-                f"Successfully fetched activities: {len(sections['commits'])} commits, "
-                f"{len(sections['pull_requests'])} PRs, {len(sections['issues'])} issues, "
-                f"{len(sections['reviews'])} reviews, {len(repo_stars)} starred repos"
+                "Successfully fetched activities: %d commits, %d PRs, %d issues, %d reviews, %d starred repos",
+                len(sections["commits"]),
+                len(sections["pull_requests"]),
+                len(sections["issues"]),
+                len(sections["reviews"]),
+                len(repo_stars),
             )
             return activity_result
 
@@ -888,14 +1193,14 @@ class GitHubIntegration:
             cutoff = since + "T00:00:00Z"
         else:
             cutoff = since
-        logger.info(f"Fetching repo stars since {cutoff} for {username} (top_n={top_n}, max_repos={max_repos})")
+        logger.info("Fetching repo stars since %s for %s (top_n=%d, max_repos=%d)", cutoff, username, top_n, max_repos)
         async with self._guard("fetch repo stars"):
             if ctx:
                 await ctx.info(f"Fetching public repos for {username}...")
-            repos_resp = await self._http.request(
+            repos_resp = await self._send(
                 "GET",
                 f"https://api.github.com/users/{username}/repos",
-                headers=self._get_headers(),
+                self._get_headers(),
                 params={"per_page": 100, "type": "public", "sort": "updated"},
             )
             self._raise_for_status(repos_resp, f"repos for {username}")
@@ -910,53 +1215,59 @@ class GitHubIntegration:
             )[:max_repos]
             if ctx:
                 await ctx.report_progress(progress=0, total=len(candidates))
-            results: list[dict[str, Any]] = []
-            for i, repo in enumerate(candidates):
-                repo_name = repo["name"]
-                total_stars: int = repo["stargazers_count"]
-                new_stars = 0
-                last_page = max(1, math.ceil(total_stars / 100))
-                for page in range(last_page, 0, -1):
-                    sg_resp = await self._http.request(
-                        "GET",
-                        f"https://api.github.com/repos/{username}/{repo_name}/stargazers",
-                        headers={**self._get_headers(), "Accept": "application/vnd.github.star+json"},
-                        params={"per_page": 100, "page": page},
-                    )
-                    self._raise_for_status(sg_resp, f"stargazers {username}/{repo_name} p{page}")
-                    stargazers = sg_resp.json()
-                    if not stargazers:
-                        break
-                    all_newer = True
-                    for sg in reversed(stargazers):
-                        if sg["starred_at"] >= cutoff:
-                            new_stars += 1
-                        else:
-                            all_newer = False
-                            break
-                    if not all_newer:
-                        break
-                if new_stars > 0:
-                    results.append(
-                        {
-                            "repo": repo_name,
-                            "owner": username,
-                            "url": repo["html_url"],
-                            "description": repo.get("description"),
-                            "new_stars": new_stars,
-                            "total_stars": total_stars,
-                        }
-                    )
+            semaphore = asyncio.Semaphore(STARS_SCAN_CONCURRENCY)
+            done = 0
+
+            async def scan(repo: dict[str, Any]) -> int:
+                nonlocal done
+                async with semaphore:
+                    new_stars = await self._count_new_stars(username, repo["name"], repo["stargazers_count"], cutoff)
+                done += 1
                 if ctx:
-                    await ctx.report_progress(progress=i + 1, total=len(candidates))
+                    await ctx.report_progress(progress=done, total=len(candidates))
+                return new_stars
+
+            counts = await _all_or_cancel(scan(repo) for repo in candidates)
+            results: list[dict[str, Any]] = [
+                {
+                    "repo": repo["name"],
+                    "owner": username,
+                    "url": repo["html_url"],
+                    "description": repo.get("description"),
+                    "new_stars": new_stars,
+                    "total_stars": repo["stargazers_count"],
+                }
+                for repo, new_stars in zip(candidates, counts, strict=True)
+                if new_stars > 0
+            ]
             results.sort(key=lambda r: r["new_stars"], reverse=True)
-            logger.info(f"Found {len(results)} repos with new stars since {cutoff} for {username}")
+            logger.info("Found %d repos with new stars since %s for %s", len(results), cutoff, username)
             return {"username": username, "since": cutoff, "repos": results[:top_n]}
 
+    async def _count_new_stars(self, owner: str, repo_name: str, total_stars: int, cutoff: str) -> int:
+        """Count stargazers of one repo starred at or after cutoff, walking pages newest-first."""
+        new_stars = 0
+        for page in range(max(1, math.ceil(total_stars / 100)), 0, -1):
+            sg_resp = await self._send(
+                "GET",
+                f"https://api.github.com/repos/{owner}/{repo_name}/stargazers",
+                {**self._get_headers(), "Accept": "application/vnd.github.star+json"},
+                params={"per_page": 100, "page": page},
+            )
+            self._raise_for_status(sg_resp, f"stargazers {owner}/{repo_name} p{page}")
+            stargazers = sg_resp.json()
+            if not stargazers:
+                break
+            for sg in reversed(stargazers):
+                if sg["starred_at"] < cutoff:
+                    return new_stars
+                new_stars += 1
+        return new_stars
+
     @_read_only(task=True)
     async def get_pr_linked_issues(self, repo_owner: str, repo_name: str, pr_number: int) -> LinkedIssuesResult:
         """Return the issues that will be auto-closed when a pull request is merged."""
-        logger.info(f"Fetching linked issues for PR #{pr_number} in {repo_owner}/{repo_name}")
+        logger.info("Fetching linked issues for PR #%d in %s/%s", pr_number, repo_owner, repo_name)
         async with self._guard("fetch linked issues"):
             result = await self._execute_graphql(
                 PR_LINKED_ISSUES_QUERY,
@@ -977,7 +1288,7 @@ class GitHubIntegration:
                 }
                 for issue in nodes
             ]
-            logger.info(f"Found {len(linked_issues)} linked issue(s) for PR #{pr_number}")
+            logger.info("Found %d linked issue(s) for PR #%d", len(linked_issues), pr_number)
             return {"pr_number": pr_number, "linked_issues": linked_issues}
 
     @staticmethod
@@ -1047,6 +1358,37 @@ class GitHubIntegration:
             return "unknown"
         return "passing"
 
+    async def _paginate_graphql(
+        self,
+        query: str,
+        variables: dict[str, Any],
+        connection_path: str,
+        *,
+        max_pages: int,
+        token: str | None = None,
+        cursor_var: str = "after",
+        cache: bool = True,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Follow pageInfo.endCursor through a connection, collecting its nodes.
+
+        connection_path is the dotted path to the connection in the result
+        (e.g. 'node.checkRuns'). Returns the nodes and whether max_pages was
+        hit before the connection was exhausted. Pages are fetched in
+        sequence since each request needs the previous page's cursor.
+
+        """
+        nodes: list[dict[str, Any]] = []
+        cursor = variables.get(cursor_var)
+        for _ in range(max_pages):
+            result = await self._execute_graphql(query, {**variables, cursor_var: cursor}, token=token, cache=cache)
+            conn = reduce(lambda data, key: (data or {}).get(key) or {}, connection_path.split("."), result)
+            nodes.extend(conn.get("nodes") or [])
+            page_info = conn.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return nodes, False
+            cursor = page_info.get("endCursor")
+        return nodes, True
+
     async def _drain_suite_runs(
         self, suite_id: str, app_name: str, after: str | None, token: str
     ) -> tuple[list[dict[str, Any]], bool]:
@@ -1056,21 +1398,15 @@ class GitHubIntegration:
         was hit before exhausting the connection.
 
         """
-        runs: list[dict[str, Any]] = []
-        cursor = after
-        for _ in range(MAX_STATUS_CHECKS_RUN_PAGES_PER_SUITE):
-            result = await self._execute_graphql(
-                CHECK_SUITE_RUNS_QUERY, {"suiteId": suite_id, "after": cursor}, token=token
-            )
-            node = result.get("node") or {}
-            run_conn = node.get("checkRuns") or {}
-            for run in run_conn.get("nodes") or []:
-                runs.append(self._run_dict(run, app_name))
-            page_info = run_conn.get("pageInfo") or {}
-            if not page_info.get("hasNextPage"):
-                return runs, False
-            cursor = page_info.get("endCursor")
-        return runs, True
+        runs, capped = await self._paginate_graphql(
+            CHECK_SUITE_RUNS_QUERY,
+            {"suiteId": suite_id, "after": after},
+            "node.checkRuns",
+            max_pages=MAX_STATUS_CHECKS_RUN_PAGES_PER_SUITE,
+            token=token,
+            cache=False,
+        )
+        return [self._run_dict(run, app_name) for run in runs], capped
 
     @_read_only(task=True)
     async def get_pr_status_checks(
@@ -1091,7 +1427,7 @@ class GitHubIntegration:
         does not act on a partial view.
 
         """
-        logger.info(f"Fetching status checks for PR #{pr_number} in {repo_owner}/{repo_name}")
+        logger.info("Fetching status checks for PR #%d in %s/%s", pr_number, repo_owner, repo_name)
         async with self._guard("fetch status checks"):
             check_runs: list[dict[str, Any]] = []
             commit_statuses: list[dict[str, Any]] = []
@@ -1110,6 +1446,7 @@ class GitHubIntegration:
                         "suitesAfter": suites_after,
                     },
                     token=token,
+                    cache=False,
                 )
                 repo_data = result.get("repository")
                 if not repo_data or not repo_data.get("pullRequest"):
@@ -1124,16 +1461,20 @@ class GitHubIntegration:
                 n_suites += len(suites_nodes)
                 check_runs.extend(self._flatten_check_runs(head_target))
 
+                # Suites page independently of one another, so drain them concurrently
+                drains = []
                 for suite in suites_nodes:
                     runs_page = (suite.get("checkRuns") or {}).get("pageInfo") or {}
-                    if not runs_page.get("hasNextPage"):
-                        continue
-                    extra_runs, runs_capped = await self._drain_suite_runs(
-                        suite_id=suite["id"],
-                        app_name=(suite.get("app") or {}).get("name", "unknown"),
-                        after=runs_page.get("endCursor"),
-                        token=token,
-                    )
+                    if runs_page.get("hasNextPage"):
+                        drains.append(
+                            self._drain_suite_runs(
+                                suite_id=suite["id"],
+                                app_name=(suite.get("app") or {}).get("name", "unknown"),
+                                after=runs_page.get("endCursor"),
+                                token=token,
+                            )
+                        )
+                for extra_runs, runs_capped in await _all_or_cancel(drains):
                     check_runs.extend(extra_runs)
                     if runs_capped:
                         truncated = True
@@ -1153,8 +1494,11 @@ class GitHubIntegration:
                 )
             overall = self._derive_overall(check_runs, commit_statuses, truncated=truncated)
             logger.info(
-                f"Status checks for PR #{pr_number}: overall={overall}, "
-                f"runs={len(check_runs)}, truncated={truncated}"
+                "Status checks for PR #%d: overall=%s, runs=%d, truncated=%s",
+                pr_number,
+                overall,
+                len(check_runs),
+                truncated,
             )
             return {
                 "pr_number": pr_number,
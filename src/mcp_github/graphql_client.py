@@ -20,26 +20,275 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from functools import lru_cache
+from os import getenv
 from typing import Any
 
 import httpx
 
 from .exceptions import GitHubAPIError, GitHubAuthError, GitHubNotFoundError, GitHubRateLimitError
 
+try:  # orjson is optional; the stdlib codec is used when it is not installed
+    import orjson  # pyright: ignore[reportMissingImports]
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
+GRAPHQL_MAX_NODES = int(getenv("MCP_GRAPHQL_MAX_NODES", "100000"))  # GitHub's own hard cap is 500k
+GRAPHQL_CACHE_TTL = float(getenv("MCP_GRAPHQL_CACHE_TTL", "60"))  # seconds, 0 disables the cache
+GRAPHQL_CACHE_SIZE = 128
+RATE_LIMIT_LOW_WATER = 100  # below this many remaining points, expired cache entries are still served
+
 logger = logging.getLogger(__name__)
 
+_NAME_RE = re.compile(r"[A-Za-z_]\w*")
+_PAGE_SIZE_ARGS = frozenset({"first", "last", "maxRepositories"})
+_DEFAULT_PAGE_SIZE = 100  # assumed when a page-size variable is not supplied
+_VARIABLE_DEF_RE = re.compile(r"\$(\w+)\s*:\s*([^,$=]+)(=)?")
+_STRING_OR_COMMENT = r'"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\\n]|\\.)*"|#[^\n\r]*'
+_LEXEME_RE = re.compile(rf"{_STRING_OR_COMMENT}|\.\.\.|[\w.]+|[^\s,]")
+_VARIABLE_RE = re.compile(rf"{_STRING_OR_COMMENT}|\$([A-Za-z_]\w*)")  # group 1 is set only outside strings
+
+
+def _estimate_nodes(query: str, variables: dict[str, Any] | None = None) -> int:
+    """Estimate the node count GitHub will charge for a query.
+
+    Each connection's page size (first/last/maxRepositories) is multiplied
+    by the page sizes of every connection enclosing it, then summed, which
+    mirrors how GitHub computes the 500k node limit.
+
+    """
+    variables = variables or {}
+    # String literals and comments can contain anything, so drop them before looking for arguments
+    tokens = [t for t in _LEXEME_RE.findall(query) if not t.startswith(('"', "#"))]
+    multipliers = [1]
+    parens = 0
+    pending: int | None = None
+    total = 0
+    for i, token in enumerate(tokens):
+        if token == "(":
+            parens += 1
+        elif token == ")":
+            parens -= 1
+        elif parens:
+            # Only argument names count; braces inside arguments are input objects, not selection sets
+            if token in _PAGE_SIZE_ARGS and tokens[i + 1 : i + 2] == [":"]:
+                pending = _page_size(tokens[i + 2 : i + 4], variables)
+        elif token == "{":
+            scale = multipliers[-1] * (pending or 1)
+            if pending:
+                total += scale
+            multipliers.append(scale)
+            pending = None
+        elif token == "}" and len(multipliers) > 1:
+            multipliers.pop()
+    return total
+
+
+def _page_size(value: list[str], variables: dict[str, Any]) -> int | None:
+    """Resolve a page-size argument value given as an integer literal or $variable."""
+    if value[:1] == ["$"] and len(value) == 2:
+        size = variables.get(value[1])
+        return size if isinstance(size, int) and size else _DEFAULT_PAGE_SIZE
+    if value and value[0].isdigit():
+        return int(value[0])
+    return None
+
+
+@lru_cache(maxsize=256)
+def _minify(query: str) -> str:
+    """Drop comments, commas and insignificant whitespace from a GraphQL document.
+
+    String literals are kept verbatim; a single space survives only where
+    two names or numbers would otherwise run together.
+
+    """
+    out: list[str] = []
+    for lexeme in _LEXEME_RE.findall(query):
+        if lexeme.startswith("#"):
+            continue
+        if out and (out[-1][-1].isalnum() or out[-1][-1] == "_") and (lexeme[0].isalnum() or lexeme[0] == "_"):
+            out.append(" ")
+        out.append(lexeme)
+    return "".join(out)
+
+
+def _matching(text: str, start: int) -> int:
+    """Index of the bracket closing the one opened at text[start], ignoring strings and comments."""
+    opener = text[start]
+    closer = {"(": ")", "{": "}"}[opener]
+    depth = 0
+    for lexeme in _LEXEME_RE.finditer(text, start):
+        if lexeme[0] == opener:
+            depth += 1
+        elif lexeme[0] == closer:
+            depth -= 1
+            if depth == 0:
+                return lexeme.start()
+    raise ValueError(f"Unbalanced {opener!r} in GraphQL document")
+
+
+def _split_operation(query: str) -> tuple[str, str]:
+    """Split a single-operation document into (variable definitions, selection body)."""
+    paren = -1
+    for lexeme in _LEXEME_RE.finditer(query):
+        if lexeme[0] == "(" and paren < 0:
+            paren = lexeme.start()
+        elif lexeme[0] == "{":
+            brace = lexeme.start()
+            break
+    else:
+        raise ValueError("GraphQL document has no selection set")
+    var_defs = query[paren + 1 : _matching(query, paren)] if paren >= 0 else ""
+    return var_defs, query[brace + 1 : _matching(query, brace)]
+
+
+def _rename_variables(text: str, prefix: str) -> str:
+    """Prefix every $variable in text, leaving string literals and comments untouched."""
+    return _VARIABLE_RE.sub(lambda m: f"${prefix}{m[1]}" if m[1] else m[0], text)
+
+
+@lru_cache(maxsize=256)
+def _required_variables(query: str) -> frozenset[str]:
+    """Names of the non-null variables without defaults that an operation declares."""
+    if "{" not in query:
+        return frozenset()
+    defs, _ = _split_operation(query)
+    return frozenset(
+        name for name, type_, default in _VARIABLE_DEF_RE.findall(defs) if type_.rstrip().endswith("!") and not default
+    )
+
+
+def _alias_selections(body: str, prefix: str) -> str:
+    """Prefix every top-level field of a selection body with an alias.
+
+    Fields inside top-level inline fragments are aliased too. Arguments,
+    directives, type conditions and nested selection sets are copied as-is.
+
+    """
+    out: list[str] = []
+    i = 0
+    literal = False  # the next name is a directive, type condition or aliased field, not a new field
+    fragment = False  # between "..." and the inline fragment's selection set
+    while (lexeme := _LEXEME_RE.search(body, i)) is not None:
+        token = lexeme[0]
+        out.append(body[i : lexeme.start()])
+        i = lexeme.end()
+        if token == "{" and fragment:
+            end = _matching(body, lexeme.start())
+            out.append("{" + _alias_selections(body[i:end], prefix) + "}")
+            i, fragment = end + 1, False
+        elif token in {"(", "{"}:
+            end = _matching(body, lexeme.start()) + 1
+            out.append(body[lexeme.start() : end])
+            i = end
+        elif token == "...":
+            out.append(token)
+            fragment = True
+        elif token in {"@", ":"} or (fragment and token == "on"):
+            out.append(token)
+            literal = True
+        elif literal or not _NAME_RE.fullmatch(token):
+            out.append(token)
+            literal = False
+        elif fragment:
+            out.append(token)  # named fragment spread
+            fragment = False
+        elif (following := _LEXEME_RE.search(body, i)) is not None and following[0] == ":":
+            out.append(prefix + token)  # existing alias; the field name after ":" is copied as-is
+        else:
+            out.append(f"{prefix}{token}: {token}")
+    out.append(body[i:])
+    return "".join(out)
+
+
+class _GraphQLCache:
+    """Bounded LRU of GraphQL results with a per-entry TTL.
+
+    Expired entries are kept until evicted so they can still be served
+    when the caller is short on rate-limit budget.
+
+    """
+
+    def __init__(self, max_size: int = GRAPHQL_CACHE_SIZE, ttl: float = GRAPHQL_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(query: str, variables: dict[str, Any] | None, token: str) -> str:
+        """Digest of the token, query and canonicalised variables."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (token, query, json.dumps(variables or {}, sort_keys=True, default=str)):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str, allow_stale: bool = False) -> dict[str, Any] | None:
+        """Return a copy of the cached result, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, data = entry
+            if not allow_stale and time.monotonic() - stored_at > self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return deepcopy(data)
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        """Store a copy of a result, evicting the least recently used entries."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), deepcopy(data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
 class GraphQLClient:
     """Client for GitHub GraphQL API v4."""
 
     GRAPHQL_URL = "https://api.github.com/graphql"
 
-    def __init__(self, token: str, timeout: int = 10):
+    def __init__(
+        self,
+        token: str,
+        timeout: int = 10,
+        limits: httpx.Limits | None = None,
+        retries: int = 0,
+        http2: bool = False,
+    ):
         """Initialise the GraphQL client."""
         self.token = token
         self.timeout = timeout
-        self.client = httpx.Client(timeout=httpx.Timeout(self.timeout))
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            transport=httpx.AsyncHTTPTransport(limits=limits or httpx.Limits(), retries=retries, http2=http2),
+        )
+        self._cache = _GraphQLCache()
+        # Last X-RateLimit-Remaining seen per token
+        self._rate_limit_remaining: dict[str, int] = {}
         self.client.headers.update(
             {
                 "Authorization": f"Bearer {token}",
@@ -47,28 +296,58 @@ class GraphQLClient:
             }
         )
 
-    def execute_query(
+    async def execute_query(
         self,
         query: str,
         variables: dict[str, Any] | None = None,
         token: str | None = None,
+        cache: bool = True,
     ) -> dict[str, Any]:
-        """Execute a GraphQL query against the GitHub API."""
-        payload: dict[str, Any] = {"query": query}
+        """Execute a GraphQL query against the GitHub API.
+
+        Successful results are cached for GRAPHQL_CACHE_TTL seconds per
+        (token, query, variables); pass cache=False for data that must be
+        fresh. Errors and timeouts are never cached. Queries missing a
+        required variable, or whose estimated node count exceeds
+        GRAPHQL_MAX_NODES, are rejected before sending.
+
+        """
+        effective_token = token or self.token
+        key = self._cache.key(query, variables, effective_token) if cache else None
+        if key is not None:
+            cached = self._cached(key, effective_token)
+            if cached is not None:
+                return cached
+
+        missing = sorted(name for name in _required_variables(query) if (variables or {}).get(name) is None)
+        if missing:
+            raise GitHubAPIError(
+                f"Missing required GraphQL variables: {', '.join('$' + name for name in missing)}",
+                code="INVALID_QUERY",
+            )
+
+        nodes = _estimate_nodes(query, variables)
+        if nodes > GRAPHQL_MAX_NODES:
+            raise GitHubAPIError(
+                f"Query would request up to {nodes} nodes (limit {GRAPHQL_MAX_NODES}); reduce first/last page sizes.",
+                code="QUERY_TOO_LARGE",
+            )
+
+        payload: dict[str, Any] = {"query": _minify(query)}
         if variables:
             payload["variables"] = variables
 
         per_call_headers = {"Authorization": f"Bearer {token}"} if token else {}
 
         try:
-            logger.debug(f"Executing GraphQL query with variables: {variables}")
-            response = self.client.post(
+            logger.debug("Executing GraphQL query with variables: %s", variables)
+            response = await self.client.post(
                 self.GRAPHQL_URL,
-                json=payload,
+                content=_json_dumps(payload),
                 headers=per_call_headers,
             )
 
-            body = response.json() if response.text else None
+            body = _json_loads(response.content) if response.content else None
             match response.status_code:
                 case 401:
                     raise GitHubAuthError(
@@ -92,15 +371,78 @@ class GraphQLClient:
                         response_body=body,
                     )
 
-            data = response.json()
+            remaining_header = response.headers.get("X-RateLimit-Remaining")
+            if remaining_header is not None:
+                self._rate_limit_remaining[effective_token] = int(remaining_header)
+
+            data = body or {}
             if "errors" in data:
                 self._handle_graphql_errors(data["errors"])
 
-            return data.get("data", {})
+            result = data.get("data", {})
+            if key is not None:
+                self._cache.put(key, result)
+            return result
 
         except httpx.HTTPError as e:
             raise GitHubAPIError(f"GraphQL request failed: {e}") from e
 
+    async def execute_batch(
+        self,
+        queries: list[tuple[str, dict[str, Any] | None]],
+        token: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute several single-operation queries in one HTTP round-trip.
+
+        Each query's top-level fields are aliased q<i>_<field> and its
+        variables renamed $q<i>_<name>, so the documents can be merged
+        into one. Results come back in input order. Queries already in
+        the result cache are answered locally and left out of the batch.
+
+        """
+        effective_token = token or self.token
+        keys = [self._cache.key(query, variables, effective_token) for query, variables in queries]
+        results: list[dict[str, Any] | None] = [self._cached(key, effective_token) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results  # type: ignore[return-value]
+
+        var_defs: list[str] = []
+        bodies: list[str] = []
+        merged_variables: dict[str, Any] = {}
+        for i in misses:
+            query, variables = queries[i]
+            prefix = f"q{i}_"
+            defs, body = _split_operation(query)
+            if defs:
+                var_defs.append(_rename_variables(defs, prefix))
+            bodies.append(_alias_selections(_rename_variables(body, prefix), prefix))
+            merged_variables.update({prefix + name: value for name, value in (variables or {}).items()})
+        header = f"query({', '.join(var_defs)})" if var_defs else "query"
+        document = f"{header} {{{' '.join(bodies)}}}"
+
+        data = await self.execute_query(document, merged_variables, token=token, cache=False)
+        for i in misses:
+            prefix = f"q{i}_"
+            result = {name.removeprefix(prefix): value for name, value in data.items() if name.startswith(prefix)}
+            self._cache.put(keys[i], result)
+            results[i] = result
+        return results  # type: ignore[return-value]
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+
+    def _cached(self, key: str, token: str) -> dict[str, Any] | None:
+        """Look up a cached result, serving stale entries when the token's rate-limit budget is low."""
+        remaining = self._rate_limit_remaining.get(token)
+        low_budget = remaining is not None and remaining < RATE_LIMIT_LOW_WATER
+        return self._cache.get(key, allow_stale=low_budget)
+
+    def _clear_cache(self) -> None:
+        """Drop every cached GraphQL result."""
+        self._cache.clear()
+
     def _handle_graphql_errors(self, errors: list[dict[str, Any]]) -> None:
         """Handle GraphQL-specific errors from the response."""
         if not errors:
@@ -110,7 +452,7 @@ class GraphQLClient:
         msg = error.get("message", "Unknown GraphQL error")
         err_type = error.get("type", "")
 
-        logger.error(f"GraphQL error: {msg} (type: {err_type})")
+        logger.error("GraphQL error: %s (type: %s)", msg, err_type)
 
         predicates = [
             ("NOT_FOUND" in err_type or "not found" in msg.lower(), GitHubNotFoundError),
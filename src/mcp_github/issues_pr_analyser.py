@@ -18,14 +18,17 @@
 
 from __future__ import annotations
 
-import inspect
 import logging
 import sys
-import traceback
+from importlib.util import find_spec
+from logging.handlers import QueueHandler, QueueListener
 from os import getenv
 from pathlib import Path
+from queue import SimpleQueue
+from types import FunctionType
 from typing import Any
 
+import anyio
 from fastmcp import FastMCP
 from fastmcp.apps.choice import Choice
 from fastmcp.apps.generative import GenerativeUI
@@ -39,11 +42,12 @@ from .auth import (
 from .github_integration import GitHubIntegration as GI
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.WARNING)
 
 PORT = int(getenv("PORT", 8081))
 HOST = getenv("HOST", "localhost")
 MCP_ENABLE_REMOTE = getenv("MCP_ENABLE_REMOTE", False)
+# uvloop is optional; the stdlib event loop is used when it is not installed
+USE_UVLOOP = find_spec("uvloop") is not None and sys.platform != "win32"
 
 _MCP_INSTRUCTIONS = """
 # GitHub PR and Issue Analyser
@@ -79,12 +83,37 @@ Workflow guidance is available as MCP resources under the skill:// URI scheme:
 - skill://user-activity/SKILL.md -- look up user profiles and contribution history
 """
 
+# Tool method names per integration class, resolved once per class
+_TOOL_CACHE: dict[type, tuple[str, ...]] = {}
+
+
+def _tool_names(cls: type) -> tuple[str, ...]:
+    """Return the public methods of cls carrying MCP annotations, in definition order."""
+    names = _TOOL_CACHE.get(cls)
+    if names is None:
+        attrs: dict[str, Any] = {}
+        for klass in reversed(cls.__mro__):
+            attrs.update(vars(klass))
+        names = tuple(
+            name
+            for name, attr in attrs.items()
+            if not name.startswith("_") and isinstance(attr, FunctionType) and hasattr(attr, "_mcp_annotations")
+        )
+        _TOOL_CACHE[cls] = names
+    return names
+
 
 class PRIssueAnalyser:
     """PRIssueAnalyser exposes GitHub PR and issue management as MCP tools."""
 
     def __init__(self):
         self.gi = GI()
+        # Transport is fixed by the environment at start-up
+        self._transport: dict[str, Any] = (
+            {"transport": "http", "host": HOST, "port": PORT, "stateless_http": True}
+            if MCP_ENABLE_REMOTE
+            else {"transport": "stdio"}
+        )
 
         def _select_auth():
             if not MCP_ENABLE_REMOTE:
@@ -106,39 +135,53 @@ class PRIssueAnalyser:
     def register_tools(self, methods: Any = None) -> None:
         if methods is None:
             methods = self.gi
-        for name in dir(methods):
-            if name.startswith("_"):
-                continue
+        for name in _tool_names(type(methods)):
             method = getattr(methods, name)
-            if inspect.isroutine(method):
-                annotations = getattr(method, "_mcp_annotations", None)
-                if annotations is not None:
-                    task = getattr(method, "_mcp_task", False)
-                    self.mcp.tool(annotations=annotations, task=task)(method)
+            self.mcp.tool(annotations=method._mcp_annotations, task=method._mcp_task)(method)
         self.mcp.add_provider(SkillsDirectoryProvider(Path(__file__).parent / "skills"))
 
     def run(self) -> None:
         """Runs the MCP server. Uses HTTP if MCP_ENABLE_REMOTE is set, otherwise stdio."""
         try:
             logger.info("Running MCP Server for GitHub PR Analysis.")
-            if MCP_ENABLE_REMOTE:
-                self.mcp.run(transport="http", host=HOST, port=PORT, stateless_http=True)
-            else:
-                self.mcp.run(transport="stdio")
-        except Exception as e:
-            logger.error(f"Fatal Error in MCP Server: {e}")
-            traceback.print_exc(file=sys.stderr)
+            anyio.run(self._serve, backend_options={"use_uvloop": USE_UVLOOP})
+        except Exception:
+            logger.exception("Fatal Error in MCP Server")
+
+    async def _serve(self) -> None:
+        """Serve until shutdown, then close the shared REST and GraphQL clients on the same loop."""
+        try:
+            await self.mcp.run_async(**self._transport)
+        finally:
+            # Sessions may come and go within a run; the pools only close once the server stops
+            with anyio.CancelScope(shield=True):
+                await self.gi.aclose()
+
+
+def _configure_logging(level: int = logging.WARNING) -> QueueListener:
+    """Route root logging through a queue so the stderr write happens on a listener thread, not the event loop."""
+    queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(queue))
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(queue, stream, respect_handler_level=True)
+    listener.start()
+    return listener
 
 
 def main() -> None:
     """Main entry point."""
+    listener = _configure_logging()
     try:
         review = PRIssueAnalyser()
         review.run()
-    except Exception as e:
-        logger.error(f"Error running main analyzer: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error running main analyzer")
         sys.exit(1)
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
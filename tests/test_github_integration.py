@@ -9,8 +9,13 @@ import httpx
 import pytest
 from fastmcp.exceptions import ToolError
 
-from mcp_github.exceptions import GitHubNotFoundError
+from mcp_github.exceptions import GitHubAPIError, GitHubNotFoundError
 from mcp_github.github_integration import (
+    ETAG_CACHE_MAX_BYTES,
+    STARS_SCAN_CONCURRENCY,
+    THROTTLE_RETRIES,
+    TRANSIENT_BACKOFF,
+    TRANSIENT_RETRIES,
     GitHubIntegration,
     _destructive,
     _read_only,
@@ -170,6 +175,27 @@ class TestConnectionPooling:
         await gi.get_latest_sha("owner", "repo")
         assert gi._http is client_before
 
+    def test_instances_have_no_attribute_dict(self, gi: GitHubIntegration):
+        assert not hasattr(gi, "__dict__")
+
+
+class TestHeaders:
+    def test_static_token_headers_built_once(self, gi: GitHubIntegration):
+        first = gi._get_headers()
+        assert first is gi._get_headers()
+        assert first["Authorization"] == "token test-token"
+
+    def test_headers_are_read_only(self, gi: GitHubIntegration):
+        with pytest.raises(TypeError):
+            gi._get_headers()["Accept"] = "x"  # type: ignore[index]
+
+    def test_oauth_headers_not_memoised(self, gi: GitHubIntegration):
+        gi._oauth_mode = True
+        with patch("mcp_github.github_integration.resolve_token", side_effect=["alice", "bob"]):
+            assert gi._get_headers()["Authorization"] == "token alice"
+            assert gi._get_headers()["Authorization"] == "token bob"
+        assert gi._headers_by_token == {}
+
 
 # ---------------------------------------------------------------------------
 # aclose / async context manager
@@ -183,6 +209,13 @@ class TestLifecycle:
         await gi.aclose()
         gi._http.aclose.assert_called_once()
 
+    @pytest.mark.anyio
+    async def test_aclose_closes_graphql_client(self, gi: GitHubIntegration):
+        gi._http.aclose = AsyncMock()
+        with patch.object(gi.graphql, "aclose", new_callable=AsyncMock) as graphql_aclose:
+            await gi.aclose()
+        graphql_aclose.assert_called_once()
+
     @pytest.mark.anyio
     async def test_async_context_manager_closes_on_exit(self, gi: GitHubIntegration):
         gi._http.aclose = AsyncMock()
@@ -199,6 +232,291 @@ class TestLifecycle:
         gi._http.aclose.assert_called_once()
 
 
+# ---------------------------------------------------------------------------
+# Conditional GETs — ETag / If-None-Match revalidation
+# ---------------------------------------------------------------------------
+
+
+class TestConditionalRequests:
+    @pytest.mark.anyio
+    async def test_304_returns_cached_response(self, gi: GitHubIntegration):
+        first = _mock_response(json_data=[{"sha": "abc"}])
+        first.headers = {"ETag": '"v1"'}
+        not_modified = _mock_response(status_code=304)
+        gi._http.request = AsyncMock(side_effect=[first, not_modified])
+        assert await gi.get_latest_sha("o", "r") == "abc"
+        assert await gi.get_latest_sha("o", "r") == "abc"
+        assert gi._http.request.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+
+    @pytest.mark.anyio
+    async def test_pr_diff_and_content_revalidated(self, gi: GitHubIntegration):
+        diff = _mock_response(text="diff --git a/x b/x")
+        diff.headers = {"ETag": '"d1"'}
+        pr_payload = {"title": "t", "body": "b", "user": {"login": "u"}, "state": "open"}
+        pr = _mock_response(json_data={**pr_payload, "created_at": "c", "updated_at": "u"})
+        pr.headers = {"ETag": '"p1"'}
+        not_modified = _mock_response(status_code=304)
+        gi._http.request = AsyncMock(side_effect=[diff, pr, not_modified, not_modified])
+        first_diff, first_pr = await gi.get_pr_diff("o", "r", 7), await gi.get_pr_content("o", "r", 7)
+        assert await gi.get_pr_diff("o", "r", 7) == first_diff
+        assert await gi.get_pr_content("o", "r", 7) == first_pr
+        sent = [c.kwargs["headers"].get("If-None-Match") for c in gi._http.request.call_args_list]
+        assert sent == [None, None, '"d1"', '"p1"']
+
+    @pytest.mark.anyio
+    async def test_oversized_body_not_cached(self, gi: GitHubIntegration):
+        diff = _mock_response(text="x")
+        diff.headers = {"ETag": '"d1"'}
+        diff.content = b"x" * (ETAG_CACHE_MAX_BYTES // 4 + 1)
+        gi._http.request = AsyncMock(return_value=diff)
+        await gi.get_pr_diff("o", "r", 7)
+        await gi.get_pr_diff("o", "r", 7)
+        assert "If-None-Match" not in gi._http.request.call_args.kwargs["headers"]
+        assert gi._etag_cache_bytes == 0
+
+    @pytest.mark.anyio
+    async def test_byte_budget_evicts_oldest(self, gi: GitHubIntegration):
+        def sized(etag: str) -> MagicMock:
+            resp = _mock_response(text="x")
+            resp.headers = {"ETag": etag}
+            resp.content = b"x" * 40
+            return resp
+
+        gi._http.request = AsyncMock(side_effect=[sized(f'"{tag}"') for tag in "abcde"])
+        with patch("mcp_github.github_integration.ETAG_CACHE_MAX_BYTES", 160):
+            for pr in range(5):
+                await gi.get_pr_diff("o", "r", pr)
+        assert [etag for etag, _ in gi._etag_cache.values()] == ['"b"', '"c"', '"d"', '"e"']
+        assert gi._etag_cache_bytes == 160
+
+    @pytest.mark.anyio
+    async def test_first_get_is_unconditional(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data=[{"sha": "abc"}]))
+        await gi.get_latest_sha("o", "r")
+        assert "If-None-Match" not in gi._http.request.call_args.kwargs["headers"]
+
+    @pytest.mark.anyio
+    async def test_writes_are_never_conditional(self, gi: GitHubIntegration):
+        resp = _mock_response(json_data={"merged": True})
+        resp.headers = {"ETag": '"v1"'}
+        gi._http.request = AsyncMock(return_value=resp)
+        await gi.merge_pr("o", "r", 1)
+        await gi.merge_pr("o", "r", 1)
+        assert "If-None-Match" not in gi._http.request.call_args.kwargs["headers"]
+        assert gi._etag_cache == {}
+
+    @pytest.mark.anyio
+    async def test_cache_is_bounded(self, gi: GitHubIntegration):
+        resp = _mock_response(json_data=[{"sha": "abc"}])
+        resp.headers = {"ETag": '"v1"'}
+        gi._http.request = AsyncMock(return_value=resp)
+        with patch("mcp_github.github_integration.ETAG_CACHE_SIZE", 2):
+            for name in ("a", "b", "c"):
+                await gi.get_latest_sha("o", name)
+        assert len(gi._etag_cache) == 2
+
+
+# ---------------------------------------------------------------------------
+# Rate-limit budget — spent tokens fail fast until their reset
+# ---------------------------------------------------------------------------
+
+
+class TestRateLimitBudget:
+    @staticmethod
+    def _spent(reset: int, **kwargs) -> MagicMock:
+        resp = _mock_response(**kwargs)
+        resp.headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset), "ETag": '"v1"'}
+        return resp
+
+    @pytest.mark.anyio
+    async def test_spent_token_fails_without_sending(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=self._spent(4_000_000_000, json_data={"merged": True}))
+        await gi.merge_pr("o", "r", 1)
+        with pytest.raises(ToolError, match="RATE_LIMITED"):
+            await gi.merge_pr("o", "r", 1)
+        assert gi._http.request.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_cached_get_served_while_spent(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=self._spent(4_000_000_000, json_data=[{"sha": "abc"}]))
+        await gi.get_latest_sha("o", "r")
+        assert await gi.get_latest_sha("o", "r") == "abc"
+        assert gi._http.request.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_requests_resume_after_reset(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=self._spent(1, json_data={"merged": True}))
+        await gi.merge_pr("o", "r", 1)
+        await gi.merge_pr("o", "r", 1)
+        assert gi._http.request.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_spent_search_bucket_does_not_block_core(self, gi: GitHubIntegration):
+        search = self._spent(4_000_000_000, json_data=_SEARCH_PAYLOAD)
+        search.headers["X-RateLimit-Resource"] = "search"
+        gi._http.request = AsyncMock(side_effect=[search, _mock_response(json_data=_issue_payload())])
+        await gi.list_open_issues_prs("o")
+        await gi.create_issue("o", "r", "A bug", "Details", ["bug"])
+        assert gi._http.request.call_count == 2
+        with pytest.raises(ToolError, match="search rate limit exhausted"):
+            await gi.list_open_issues_prs("o", per_page=10)
+        assert gi._http.request.call_count == 2
+
+
+class TestSecondaryRateLimit:
+    @staticmethod
+    def _throttled(status_code: int, headers: dict) -> MagicMock:
+        resp = _mock_response(status_code, text="You have exceeded a secondary rate limit")
+        resp.headers = headers
+        return resp
+
+    @pytest.mark.anyio
+    async def test_retry_after_is_waited_out_then_resent(self, gi: GitHubIntegration):
+        ok = _mock_response(json_data={"merged": True})
+        gi._http.request = AsyncMock(side_effect=[self._throttled(403, {"Retry-After": "2"}), ok])
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            assert (await gi.merge_pr("o", "r", 1))["merged"] is True
+        assert gi._http.request.call_count == 2
+        assert 1 < sleep.call_args.args[0] < 3
+
+    @pytest.mark.anyio
+    async def test_throttle_window_is_shared_by_later_calls(self, gi: GitHubIntegration):
+        ok = _mock_response(json_data={"merged": True})
+        gi._http.request = AsyncMock(side_effect=[self._throttled(429, {"Retry-After": "5"}), ok, ok])
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await gi.merge_pr("o", "r", 1)
+            await gi.merge_pr("o", "r", 2)
+        assert sleep.await_count == 2
+        assert all(4 < c.args[0] < 6 for c in sleep.call_args_list)
+
+    @pytest.mark.anyio
+    async def test_expired_window_is_dropped(self, gi: GitHubIntegration):
+        gi._throttled_until["token test-token"] = 0.0
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data={"merged": True}))
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await gi.merge_pr("o", "r", 1)
+        sleep.assert_not_called()
+        assert gi._throttled_until == {}
+
+    @pytest.mark.anyio
+    async def test_gives_up_after_retry_budget(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=self._throttled(429, {}))
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(ToolError):
+                await gi.merge_pr("o", "r", 1)
+        assert sleep.await_count == THROTTLE_RETRIES
+        assert gi._http.request.call_count == THROTTLE_RETRIES + 1
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "headers",
+        [{"Retry-After": "3600"}, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4000000000"}],
+    )
+    async def test_long_or_primary_limits_are_not_waited(self, gi: GitHubIntegration, headers: dict):
+        gi._http.request = AsyncMock(return_value=self._throttled(403, headers))
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(ToolError):
+                await gi.merge_pr("o", "r", 1)
+        sleep.assert_not_called()
+        assert gi._http.request.call_count == 1
+
+
+class TestTransientRetry:
+    @pytest.mark.anyio
+    async def test_get_resent_after_5xx(self, gi: GitHubIntegration):
+        ok = _mock_response(json_data=[{"sha": "abc"}])
+        gi._http.request = AsyncMock(side_effect=[_mock_response(502), ok])
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            assert await gi.get_latest_sha("o", "r") == "abc"
+        assert gi._http.request.call_count == 2
+        assert 0 < sleep.call_args.args[0] <= TRANSIENT_BACKOFF[1]
+
+    @pytest.mark.anyio
+    async def test_get_resent_after_dropped_connection(self, gi: GitHubIntegration):
+        ok = _mock_response(json_data=[{"sha": "abc"}])
+        gi._http.request = AsyncMock(side_effect=[httpx.RemoteProtocolError("Server disconnected"), ok])
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock):
+            assert await gi.get_latest_sha("o", "r") == "abc"
+
+    @pytest.mark.anyio
+    async def test_get_gives_up_after_retry_budget(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(503))
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(ToolError):
+                await gi.get_latest_sha("o", "r")
+        assert gi._http.request.call_count == TRANSIENT_RETRIES + 1
+
+    @pytest.mark.anyio
+    async def test_writes_are_not_resent(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(side_effect=httpx.ReadTimeout("timed out"))
+        with patch("mcp_github.github_integration.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(ToolError):
+                await gi.merge_pr("o", "r", 1)
+        sleep.assert_not_called()
+        assert gi._http.request.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# list_open_issues_prs — short-lived listing cache
+# ---------------------------------------------------------------------------
+
+_SEARCH_PAYLOAD = {
+    "total_count": 1,
+    "items": [
+        {
+            "html_url": "https://github.com/o/r/pull/1",
+            "title": "t",
+            "number": 1,
+            "state": "open",
+            "created_at": "c",
+            "updated_at": "u",
+            "user": {"login": "u"},
+        }
+    ],
+}
+
+
+class TestListCache:
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("token_error", [RuntimeError("no OAuth token"), ValueError("empty token")])
+    async def test_missing_token_raises_tool_error(self, gi: GitHubIntegration, token_error: Exception):
+        with patch("mcp_github.github_integration.resolve_token", side_effect=token_error):
+            with pytest.raises(ToolError, match=str(token_error)):
+                await gi.list_open_issues_prs("o")
+        gi._http.request.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_repeat_listing_served_from_cache(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data=_SEARCH_PAYLOAD))
+        first = await gi.list_open_issues_prs("o")
+        first["open_prs"].clear()
+        assert (await gi.list_open_issues_prs("o"))["open_prs"][0]["number"] == 1
+        assert gi._http.request.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_different_page_not_shared(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data=_SEARCH_PAYLOAD))
+        await gi.list_open_issues_prs("o")
+        await gi.list_open_issues_prs("o", page=2)
+        assert gi._http.request.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_write_clears_cache(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data=_SEARCH_PAYLOAD))
+        await gi.list_open_issues_prs("o")
+        await gi.merge_pr("o", "r", 1)
+        await gi.list_open_issues_prs("o")
+        assert gi._http.request.call_count == 3
+
+    @pytest.mark.anyio
+    async def test_expired_listing_refetched(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data=_SEARCH_PAYLOAD))
+        with patch("mcp_github.github_integration.time.monotonic", side_effect=[0.0, 1000.0, 1000.0]):
+            await gi.list_open_issues_prs("o")
+            await gi.list_open_issues_prs("o")
+        assert gi._http.request.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # merge_pr — request shape and GitHub error surfacing
 # ---------------------------------------------------------------------------
@@ -314,24 +632,24 @@ class TestUpdatePrDescription:
 class TestGetUserActivitiesContext:
     @pytest.mark.anyio
     async def test_no_ctx_runs_without_error(self, gi: GitHubIntegration):
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
             result = await gi.get_user_activities("user1")
         assert result["username"] == "user1"
         assert result["commits"] == []
 
     @pytest.mark.anyio
     async def test_pre_call_info_fires_before_graphql(self, gi: GitHubIntegration):
-        """ctx.info('Querying...') must appear before the asyncio.to_thread call."""
+        """ctx.info('Querying...') must appear before the GraphQL call."""
         order: list[str] = []
 
-        async def fake_to_thread(fn, *args, **kwargs):
+        async def fake_execute(*args, **kwargs):
             order.append("graphql")
             return _EMPTY_CONTRIBUTIONS
 
         ctx = _mock_ctx()
         ctx.info.side_effect = lambda msg: order.append(f"info:{msg}")
 
-        with patch.object(asyncio, "to_thread", side_effect=fake_to_thread):
+        with patch.object(gi.graphql, "execute_query", side_effect=fake_execute):
             await gi.get_user_activities("user1", ctx=ctx)
 
         assert order[0].startswith("info:Querying")
@@ -340,7 +658,7 @@ class TestGetUserActivitiesContext:
     @pytest.mark.anyio
     async def test_progress_reported_six_times(self, gi: GitHubIntegration):
         ctx = _mock_ctx()
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
             await gi.get_user_activities("user1", ctx=ctx)
         assert ctx.report_progress.call_count == 6
         progress_values = [c.kwargs["progress"] for c in ctx.report_progress.call_args_list]
@@ -349,7 +667,7 @@ class TestGetUserActivitiesContext:
     @pytest.mark.anyio
     async def test_stage_info_messages_sent(self, gi: GitHubIntegration):
         ctx = _mock_ctx()
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
             await gi.get_user_activities("user1", ctx=ctx)
         info_calls = [c.args[0] for c in ctx.info.call_args_list]
         # pre-call + 5 stage messages
@@ -363,7 +681,7 @@ class TestGetUserActivitiesContext:
     @pytest.mark.anyio
     async def test_progress_total_is_always_five(self, gi: GitHubIntegration):
         ctx = _mock_ctx()
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_CONTRIBUTIONS):
             await gi.get_user_activities("user1", ctx=ctx)
         totals = {c.kwargs["total"] for c in ctx.report_progress.call_args_list}
         assert totals == {5}
@@ -442,6 +760,61 @@ class TestGetRepoStarsSince:
 
         assert len(result["repos"]) == 3
 
+    @pytest.mark.anyio
+    async def test_repos_scanned_concurrently_up_to_limit(self, gi: GitHubIntegration):
+        repos_payload = [
+            {"name": f"repo-{i}", "stargazers_count": 1, "html_url": f"https://github.com/u/repo-{i}", "description": None}
+            for i in range(STARS_SCAN_CONCURRENCY * 2)
+        ]
+        in_flight = peak = 0
+
+        async def request(method, url, **kw):
+            nonlocal in_flight, peak
+            if url.endswith("/repos"):
+                return _mock_response(json_data=repos_payload)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return _mock_response(json_data=[{"starred_at": "2099-06-01T00:00:00Z", "user": {}}])
+
+        gi._http.request = AsyncMock(side_effect=request)
+        ctx = _mock_ctx()
+
+        result = await gi.get_repo_stars_since("u", since="2090-01-01", top_n=100, ctx=ctx)
+
+        assert peak == STARS_SCAN_CONCURRENCY
+        assert [r["repo"] for r in result["repos"]] == [r["name"] for r in repos_payload]
+        assert ctx.report_progress.call_args.kwargs == {"progress": len(repos_payload), "total": len(repos_payload)}
+
+    @pytest.mark.anyio
+    async def test_failed_scan_cancels_the_others(self, gi: GitHubIntegration):
+        repos_payload = [
+            {"name": name, "stargazers_count": 1, "html_url": f"https://github.com/u/{name}", "description": None}
+            for name in ("slow", "gone")
+        ]
+        cancelled = asyncio.Event()
+
+        async def request(method, url, **kw):
+            if url.endswith("/repos"):
+                return _mock_response(json_data=repos_payload)
+            if "/gone/" in url:
+                return _mock_response(status_code=404)
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        gi._http.request = AsyncMock(side_effect=request)
+        ctx = _mock_ctx()
+
+        with pytest.raises(GitHubNotFoundError):
+            await gi.get_repo_stars_since("u", since="2090-01-01", ctx=ctx)
+
+        assert cancelled.is_set()
+        assert ctx.report_progress.call_count == 1  # only the initial progress=0
+
     @pytest.mark.anyio
     async def test_default_since_is_30_days_ago(self, gi: GitHubIntegration):
         gi._http.request = AsyncMock(return_value=_mock_response(json_data=[]))
@@ -459,7 +832,7 @@ class TestGetRepoStarsSince:
 class TestGetPrStatusChecks:
     @pytest.mark.anyio
     async def test_no_ctx_returns_result_without_info_call(self, gi: GitHubIntegration):
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_STATUS_CHECKS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_STATUS_CHECKS):
             result = await gi.get_pr_status_checks("owner", "repo", 1, ctx=None)
         assert "overall" in result
         assert "check_runs" in result
@@ -467,7 +840,7 @@ class TestGetPrStatusChecks:
     @pytest.mark.anyio
     async def test_ctx_info_includes_suite_run_and_status_counts(self, gi: GitHubIntegration):
         ctx = _mock_ctx()
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_STATUS_CHECKS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_STATUS_CHECKS):
             await gi.get_pr_status_checks("owner", "repo", 1, ctx=ctx)
         ctx.info.assert_called_once()
         msg = ctx.info.call_args[0][0]
@@ -491,14 +864,14 @@ class TestGetPrStatusChecks:
             }
         }
         ctx = _mock_ctx()
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=data):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=data):
             await gi.get_pr_status_checks("owner", "repo", 1, ctx=ctx)
         msg = ctx.info.call_args[0][0]
         assert "5 check suites" in msg
 
     @pytest.mark.anyio
     async def test_overall_status_derived_correctly(self, gi: GitHubIntegration):
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, return_value=_EMPTY_STATUS_CHECKS):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value=_EMPTY_STATUS_CHECKS):
             result = await gi.get_pr_status_checks("owner", "repo", 1)
         assert result["overall"] == "unknown"
 
@@ -597,7 +970,7 @@ class TestStatusChecksPagination:
     async def test_paginates_suites_until_complete(self, gi: GitHubIntegration):
         page1 = _status_page([_suite_with_id("s1", [_run("a")])], has_next=True, end_cursor="cursor-1")
         page2 = _status_page([_suite_with_id("s2", [_run("b")])], has_next=False)
-        with patch.object(asyncio, "to_thread", new_callable=AsyncMock, side_effect=[page1, page2]) as p:
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=[page1, page2]) as p:
             result = await gi.get_pr_status_checks("owner", "repo", 1)
         assert p.await_count == 2
         assert {r["name"] for r in result["check_runs"]} == {"a", "b"}
@@ -608,7 +981,7 @@ class TestStatusChecksPagination:
     async def test_truncated_when_suite_cap_hit(self, gi: GitHubIntegration):
         infinite_page = _status_page([_suite_with_id("s1", [_run("x")])], has_next=True, end_cursor="more")
         with patch.object(
-            asyncio, "to_thread", new_callable=AsyncMock, side_effect=[infinite_page] * 10
+            gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=[infinite_page] * 10
         ) as p:
             result = await gi.get_pr_status_checks("owner", "repo", 1)
         assert p.await_count == 5
@@ -619,7 +992,7 @@ class TestStatusChecksPagination:
         suite_page = _status_page([_suite_with_id("s1", [_run("a")], runs_has_next=True)])
         extra_runs = _runs_page([_run("b"), _run("c")], has_next=False)
         with patch.object(
-            asyncio, "to_thread", new_callable=AsyncMock, side_effect=[suite_page, extra_runs]
+            gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=[suite_page, extra_runs]
         ) as p:
             result = await gi.get_pr_status_checks("owner", "repo", 1)
         assert p.await_count == 2
@@ -632,8 +1005,8 @@ class TestStatusChecksPagination:
         suite_page = _status_page([_suite_with_id("s1", [_run("a")], runs_has_next=True)])
         infinite_runs = _runs_page([_run("more")], has_next=True)
         with patch.object(
-            asyncio,
-            "to_thread",
+            gi.graphql,
+            "execute_query",
             new_callable=AsyncMock,
             side_effect=[suite_page, *([infinite_runs] * 10)],
         ) as p:
@@ -650,8 +1023,8 @@ class TestStatusChecksPagination:
         )
         infinite_runs = _runs_page([_run("more")], has_next=True)
         with patch.object(
-            asyncio,
-            "to_thread",
+            gi.graphql,
+            "execute_query",
             new_callable=AsyncMock,
             side_effect=[suite_page, *([infinite_runs] * 10)],
         ):
@@ -666,19 +1039,44 @@ class TestStatusChecksPagination:
         )
         extra_runs = _runs_page([_run("b")], has_next=False)
         with patch.object(
-            asyncio, "to_thread", new_callable=AsyncMock, side_effect=[suite_page, extra_runs]
+            gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=[suite_page, extra_runs]
         ):
             result = await gi.get_pr_status_checks("owner", "repo", 1)
         assert all(r["suite_app"] == "Codacy Production" for r in result["check_runs"])
 
+    @pytest.mark.anyio
+    async def test_failed_drain_cancels_the_others(self, gi: GitHubIntegration):
+        suites = [_suite_with_id(id_, [_run(id_)], runs_has_next=True) for id_ in ("slow", "bad")]
+        suite_page = _status_page(suites)
+        cancelled = asyncio.Event()
+
+        async def execute_query(query, variables=None, **kw):
+            suite_id = (variables or {}).get("suiteId")
+            if suite_id is None:
+                return suite_page
+            if suite_id == "bad":
+                raise GitHubAPIError("boom")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with (
+            patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=execute_query),
+            pytest.raises(GitHubAPIError, match="boom"),
+        ):
+            await gi.get_pr_status_checks("owner", "repo", 1)
+        assert cancelled.is_set()
+
     @pytest.mark.anyio
     async def test_ctx_info_announces_truncation(self, gi: GitHubIntegration):
         suite_page = _status_page([_suite_with_id("s1", [_run("a")], runs_has_next=True)])
         infinite_runs = _runs_page([_run("x")], has_next=True)
         ctx = _mock_ctx()
         with patch.object(
-            asyncio,
-            "to_thread",
+            gi.graphql,
+            "execute_query",
             new_callable=AsyncMock,
             side_effect=[suite_page, *([infinite_runs] * 10)],
         ):
@@ -686,6 +1084,136 @@ class TestStatusChecksPagination:
         msg = ctx.info.call_args[0][0]
         assert "truncated" in msg
 
+    @pytest.mark.anyio
+    async def test_suites_drained_concurrently_in_order(self, gi: GitHubIntegration):
+        suite_page = _status_page(
+            [
+                _suite_with_id("s1", [_run("a")], runs_has_next=True),
+                _suite_with_id("s2", [_run("b")], runs_has_next=True),
+            ]
+        )
+        started: list[str] = []
+
+        async def execute(query, variables=None, **kw):
+            if "suiteId" not in variables:
+                return suite_page
+            started.append(variables["suiteId"])
+            await asyncio.sleep(0)
+            assert started == ["s1", "s2"], "second drain must start before the first finishes"
+            return _runs_page([_run(f"{variables['suiteId']}-extra")])
+
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=execute):
+            result = await gi.get_pr_status_checks("owner", "repo", 1)
+        assert [r["name"] for r in result["check_runs"]] == ["a", "b", "s1-extra", "s2-extra"]
+
+
+class TestPaginateGraphql:
+    @pytest.mark.anyio
+    async def test_follows_end_cursor_along_dotted_path(self, gi: GitHubIntegration):
+        def page(nodes: list[int], cursor: str | None) -> dict:
+            info = {"hasNextPage": cursor is not None, "endCursor": cursor}
+            return {"organization": {"repositories": {"nodes": nodes, "pageInfo": info}}}
+
+        with patch.object(
+            gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=[page([1, 2], "c1"), page([3], None)]
+        ) as p:
+            nodes, capped = await gi._paginate_graphql(
+                "q", {"org": "o"}, "organization.repositories", max_pages=5, token="t"
+            )
+        assert nodes == [1, 2, 3]
+        assert capped is False
+        assert [c.kwargs["variables"]["after"] for c in p.call_args_list] == [None, "c1"]
+
+    @pytest.mark.anyio
+    async def test_missing_connection_yields_no_nodes(self, gi: GitHubIntegration):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value={"node": None}):
+            nodes, capped = await gi._paginate_graphql("q", {}, "node.checkRuns", max_pages=5, token="t")
+        assert nodes == []
+        assert capped is False
+
+
+class TestGraphqlSingleFlight:
+    @pytest.mark.anyio
+    async def test_concurrent_identical_queries_share_one_request(self, gi: GitHubIntegration):
+        async def slow(*a, **kw):
+            await asyncio.sleep(0)
+            return {"x": [1]}
+
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=slow) as p:
+            first, second = await asyncio.gather(
+                gi._execute_graphql("q", {"a": 1}, token="t"), gi._execute_graphql("q", {"a": 1}, token="t")
+            )
+        assert p.call_count == 1
+        assert first == second == {"x": [1]}
+        assert first is not second
+        assert gi._graphql_inflight == {}
+
+    @pytest.mark.anyio
+    async def test_every_caller_gets_its_own_copy(self, gi: GitHubIntegration):
+        shared = {"x": [1]}
+
+        async def slow(*a, **kw):
+            await asyncio.sleep(0)
+            return shared
+
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=slow):
+            first, second = await asyncio.gather(
+                gi._execute_graphql("q", {}, token="t"), gi._execute_graphql("q", {}, token="t")
+            )
+        first["x"].append(2)
+        assert second == shared == {"x": [1]}
+        assert shared is not first and shared is not second
+
+    @pytest.mark.anyio
+    async def test_request_cancelled_only_when_every_caller_is(self, gi: GitHubIntegration):
+        started, release = asyncio.Event(), asyncio.Event()
+        request_cancelled = False
+
+        async def hang(*a, **kw):
+            nonlocal request_cancelled
+            started.set()
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                request_cancelled = True
+                raise
+            return {"ok": True}
+
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=hang):
+            first = asyncio.ensure_future(gi._execute_graphql("q", {}, token="t"))
+            second = asyncio.ensure_future(gi._execute_graphql("q", {}, token="t"))
+            await started.wait()
+            first.cancel()
+            await asyncio.sleep(0)
+            assert not request_cancelled
+            second.cancel()
+            await asyncio.gather(first, second, return_exceptions=True)
+            await asyncio.sleep(0)
+        assert request_cancelled
+        assert gi._graphql_inflight == {}
+        assert gi._graphql_waiters == {}
+
+    @pytest.mark.anyio
+    async def test_different_variables_not_coalesced(self, gi: GitHubIntegration):
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, return_value={}) as p:
+            await asyncio.gather(
+                gi._execute_graphql("q", {"a": 1}, token="t"), gi._execute_graphql("q", {"a": 2}, token="t")
+            )
+        assert p.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_failure_propagates_to_every_caller(self, gi: GitHubIntegration):
+        async def boom(*a, **kw):
+            await asyncio.sleep(0)
+            raise RuntimeError("down")
+
+        with patch.object(gi.graphql, "execute_query", new_callable=AsyncMock, side_effect=boom) as p:
+            results = await asyncio.gather(
+                gi._execute_graphql("q", {}, token="t"), gi._execute_graphql("q", {}, token="t"), return_exceptions=True
+            )
+        assert p.call_count == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
 
 # ---------------------------------------------------------------------------
 # Response trimming — write tools return compact contracts, not raw payloads
@@ -777,7 +1305,7 @@ class TestResponseTrimming:
         }
 
     @pytest.mark.anyio
-    async def test_add_inline_pr_comment_returns_trimmed_comment(self, gi: GitHubIntegration):
+    async def test_add_pr_comments_with_path_and_line_posts_inline(self, gi: GitHubIntegration):
         comment_payload = {
             "id": 22,
             "node_id": "PRRC_abc",
@@ -797,7 +1325,7 @@ class TestResponseTrimming:
             _mock_response(json_data=comment_payload),
         ])
         gi._http.request = AsyncMock(side_effect=lambda *a, **kw: next(responses))
-        result = await gi.add_inline_pr_comment("o", "r", 5, "app.py", 3, "fix this")
+        result = await gi.add_pr_comments("o", "r", 5, "fix this", path="app.py", line=3)
         assert result == {
             "id": 22,
             "body": "fix this",
@@ -805,8 +1333,36 @@ class TestResponseTrimming:
             "html_url": "https://github.com/o/r/pull/5#discussion_r22",
             "created_at": "2026-07-01T00:00:00Z",
         }
-        post_kwargs = gi._http.request.call_args_list[1].kwargs
-        assert post_kwargs["json"]["commit_id"] == "abc123"
+        post = gi._http.request.call_args_list[1]
+        assert post.args[1].endswith("/pulls/5/comments")
+        assert post.kwargs["json"]["commit_id"] == "abc123"
+
+    @pytest.mark.anyio
+    async def test_add_pr_comments_rejects_path_without_line(self, gi: GitHubIntegration):
+        with pytest.raises(ToolError, match="path and line"):
+            await gi.add_pr_comments("o", "r", 5, "fix this", path="app.py")
+        gi._http.request.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_add_inline_pr_comments_posts_one_review(self, gi: GitHubIntegration):
+        review = {"id": 44, "state": "COMMENTED", "html_url": "https://github.com/o/r/pull/5#pullrequestreview-44"}
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data={**review, "user": _NOISE_USER}))
+        comments = [{"path": "a.py", "line": 1, "body": "x"}, {"path": "b.py", "line": 9, "body": "y"}]
+        result = await gi.add_inline_pr_comments("o", "r", 5, comments)
+        assert result == {**review, "submitted_at": None, "comments_posted": 2}
+        gi._http.request.assert_awaited_once()
+        assert gi._http.request.call_args.args[1].endswith("/pulls/5/reviews")
+        payload = gi._http.request.call_args.kwargs["json"]
+        assert payload["event"] == "COMMENT"
+        assert "body" not in payload
+        assert [c["path"] for c in payload["comments"]] == ["a.py", "b.py"]
+        assert {c["side"] for c in payload["comments"]} == {"RIGHT"}
+
+    @pytest.mark.anyio
+    async def test_add_inline_pr_comments_rejects_empty_list(self, gi: GitHubIntegration):
+        with pytest.raises(ToolError):
+            await gi.add_inline_pr_comments("o", "r", 5, [])
+        gi._http.request.assert_not_called()
 
     @pytest.mark.anyio
     async def test_create_issue_returns_trimmed_issue(self, gi: GitHubIntegration):
@@ -886,6 +1442,26 @@ class TestResponseTrimming:
         assert "'b'" in result["message"]
         assert "issue" not in result
 
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        ("body", "explicit", "expected"),
+        [("notes", None, False), ("", None, True), ("notes", True, True), ("", False, False)],
+    )
+    async def test_create_release_generates_notes_only_without_body(
+        self, gi: GitHubIntegration, body: str, explicit: bool | None, expected: bool
+    ):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data={}))
+        await gi.create_release("o", "r", "v1.0.0", "v1.0.0", body, generate_release_notes=explicit)
+        assert gi._http.request.call_args.kwargs["json"]["generate_release_notes"] is expected
+
+    @pytest.mark.anyio
+    async def test_create_release_sends_target_commitish_only_when_set(self, gi: GitHubIntegration):
+        gi._http.request = AsyncMock(return_value=_mock_response(json_data={}))
+        await gi.create_release("o", "r", "v1.0.0", "v1.0.0", "notes")
+        assert "target_commitish" not in gi._http.request.call_args.kwargs["json"]
+        await gi.create_release("o", "r", "v1.0.1", "v1.0.1", "notes", target_commitish="release/1.0")
+        assert gi._http.request.call_args.kwargs["json"]["target_commitish"] == "release/1.0"
+
     @pytest.mark.anyio
     async def test_create_release_returns_trimmed_release(self, gi: GitHubIntegration):
         payload = {
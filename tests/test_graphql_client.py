@@ -0,0 +1,292 @@
+"""Tests for graphql_client.py — result caching, query batching and node budgets."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from mcp_github import graphql_queries
+from mcp_github.exceptions import GitHubAPIError
+from mcp_github.graphql_client import (
+    GRAPHQL_MAX_NODES,
+    GraphQLClient,
+    _estimate_nodes,
+    _GraphQLCache,
+    _minify,
+    _required_variables,
+)
+
+
+def _mock_response(data: dict | None = None, errors: list | None = None, headers: dict | None = None) -> MagicMock:
+    body: dict = {"data": data if data is not None else {}}
+    if errors is not None:
+        body["errors"] = errors
+    r = MagicMock(spec=httpx.Response)
+    r.status_code = 200
+    r.content = json.dumps(body).encode()
+    r.reason_phrase = "OK"
+    r.headers = headers or {}
+    return r
+
+
+def _posted(client: GraphQLClient) -> dict:
+    """Decode the JSON body of the last POST."""
+    return json.loads(client.client.post.call_args.kwargs["content"])
+
+
+@pytest.fixture
+def client() -> GraphQLClient:
+    """GraphQLClient with a mocked transport."""
+    instance = GraphQLClient("test-token")
+    instance.client = AsyncMock()
+    return instance
+
+
+class TestResultCache:
+    """TTL + LRU caching of successful query results."""
+
+    @pytest.mark.anyio
+    async def test_repeated_query_served_from_cache(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"user": {"login": "u"}})
+        first = await client.execute_query("query { viewer { login } }", {"a": 1})
+        second = await client.execute_query("query { viewer { login } }", {"a": 1})
+        assert first == second == {"user": {"login": "u"}}
+        assert client.client.post.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_variable_order_does_not_change_key(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        await client.execute_query("q", {"a": 1, "b": 2})
+        await client.execute_query("q", {"b": 2, "a": 1})
+        assert client.client.post.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_tokens_do_not_share_entries(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        await client.execute_query("q", {}, token="alice")
+        await client.execute_query("q", {}, token="bob")
+        assert client.client.post.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_cache_false_always_posts(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        await client.execute_query("q", {}, cache=False)
+        await client.execute_query("q", {}, cache=False)
+        assert client.client.post.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_errors_are_not_cached(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response(errors=[{"message": "boom"}])
+        for _ in range(2):
+            with pytest.raises(GitHubAPIError):
+                await client.execute_query("q", {})
+        assert client.client.post.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_cached_result_is_a_copy(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"nodes": [1]})
+        (await client.execute_query("q", {}))["nodes"].append(2)
+        assert await client.execute_query("q", {}) == {"nodes": [1]}
+
+    @pytest.mark.anyio
+    async def test_clear_cache_forces_refetch(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        await client.execute_query("q", {})
+        client._clear_cache()
+        await client.execute_query("q", {})
+        assert client.client.post.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_expired_entry_refetched(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        with patch("mcp_github.graphql_client.time.monotonic", side_effect=[0.0, 1000.0, 1000.0]):
+            await client.execute_query("q", {})
+            await client.execute_query("q", {})
+        assert client.client.post.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_expired_entry_served_when_rate_limit_low(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1}, headers={"X-RateLimit-Remaining": "3"})
+        with patch("mcp_github.graphql_client.time.monotonic", side_effect=[0.0, 1000.0]):
+            await client.execute_query("q", {})
+            assert await client.execute_query("q", {}) == {"x": 1}
+        assert client.client.post.call_count == 1
+
+    def test_lru_evicts_oldest(self):
+        cache = _GraphQLCache(max_size=2, ttl=60)
+        for k in ("a", "b", "c"):
+            cache.put(k, {"k": k})
+        assert cache.get("a") is None
+        assert cache.get("c") == {"k": "c"}
+
+    def test_zero_ttl_disables_cache(self):
+        cache = _GraphQLCache(ttl=0)
+        cache.put("a", {"x": 1})
+        assert cache.get("a") is None
+
+
+class TestResponseParsing:
+    @pytest.mark.anyio
+    async def test_body_parsed_once(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        with patch("mcp_github.graphql_client._json_loads", side_effect=json.loads) as loads:
+            assert await client.execute_query("q", {}, cache=False) == {"x": 1}
+        loads.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_empty_body_yields_empty_result(self, client: GraphQLClient):
+        response = _mock_response()
+        response.content = b""
+        client.client.post.return_value = response
+        assert await client.execute_query("q", {}, cache=False) == {}
+
+
+class TestMinify:
+    """Comment and whitespace stripping of outgoing documents."""
+
+    def test_ignored_tokens_dropped(self):
+        query = "query($n: Int = -1) {\n  # comment\n  a(first: $n, x: 1.5e-3) { ... on Foo { id name } }\n}"
+        assert _minify(query) == "query($n:Int=-1){a(first:$n x:1.5e-3){...on Foo{id name}}}"
+
+    def test_string_literals_kept_verbatim(self):
+        assert _minify('query { a(q: "x,  # y") { id } }') == 'query{a(q:"x,  # y"){id}}'
+
+    @pytest.mark.anyio
+    async def test_posted_query_is_minified(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"x": 1})
+        await client.execute_query(
+            graphql_queries.PR_LINKED_ISSUES_QUERY, {"owner": "o", "repo": "r", "number": 1}, cache=False
+        )
+        assert _posted(client)["query"] == _minify(graphql_queries.PR_LINKED_ISSUES_QUERY)
+        assert "\n" not in _posted(client)["query"]
+
+
+class TestExecuteBatch:
+    """Alias-based batching of several queries into one POST."""
+
+    _Q_USER = "query($username: String!) { user(login: $username) { login } }"
+    _Q_REPO = "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { id } }"
+
+    @pytest.mark.anyio
+    async def test_single_post_with_prefixed_variables_and_aliases(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"q0_user": {"login": "u"}, "q1_repository": {"id": "R"}})
+        results = await client.execute_batch(
+            [(self._Q_USER, {"username": "u"}), (self._Q_REPO, {"owner": "o", "name": "r"})]
+        )
+        assert results == [{"user": {"login": "u"}}, {"repository": {"id": "R"}}]
+        assert client.client.post.call_count == 1
+        payload = _posted(client)
+        assert payload["variables"] == {"q0_username": "u", "q1_owner": "o", "q1_name": "r"}
+        assert "q0_user:user(login:$q0_username)" in payload["query"]
+        assert "q1_repository:repository(owner:$q1_owner name:$q1_name)" in payload["query"]
+        assert payload["query"].startswith("query($q0_username:String!$q1_owner:String!$q1_name:String!)")
+
+    @pytest.mark.anyio
+    async def test_existing_alias_is_prefixed_not_doubled(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"q0_me": {"login": "u"}})
+        assert await client.execute_batch([("query { me: viewer { login } }", None)]) == [{"me": {"login": "u"}}]
+        assert "q0_me:viewer" in _posted(client)["query"]
+
+    @pytest.mark.anyio
+    async def test_inline_fragment_fields_are_aliased(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"q0_viewer": {"login": "u"}})
+        results = await client.execute_batch([("query { ... on Query { viewer { login } } }", None)])
+        assert results == [{"viewer": {"login": "u"}}]
+        assert "...on Query{q0_viewer:viewer{login}}" in _posted(client)["query"]
+
+    @pytest.mark.anyio
+    async def test_directives_are_not_aliased(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"q0_viewer": {"login": "u"}})
+        await client.execute_batch([("query($x: Boolean!) { viewer @include(if: $x) { login } }", {"x": True})])
+        assert "q0_viewer:viewer@include(if:$q0_x){login}" in _posted(client)["query"]
+
+    @pytest.mark.anyio
+    async def test_string_literals_are_left_alone(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"q0_search": {"issueCount": 1}})
+        query = 'query($n: Int!) { search(query: "is:pr { $n", type: ISSUE, first: $n) { issueCount } }'
+        assert await client.execute_batch([(query, {"n": 1})]) == [{"search": {"issueCount": 1}}]
+        assert 'q0_search:search(query:"is:pr { $n"type:ISSUE first:$q0_n)' in _posted(client)["query"]
+
+    @pytest.mark.anyio
+    async def test_cached_queries_are_left_out_of_the_batch(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"user": {"login": "u"}})
+        await client.execute_query(self._Q_USER, {"username": "u"})
+        client.client.post.return_value = _mock_response({"q1_repository": {"id": "R"}})
+        results = await client.execute_batch(
+            [(self._Q_USER, {"username": "u"}), (self._Q_REPO, {"owner": "o", "name": "r"})]
+        )
+        assert results == [{"user": {"login": "u"}}, {"repository": {"id": "R"}}]
+        assert "q0_" not in _posted(client)["query"]
+
+    @pytest.mark.anyio
+    async def test_all_cached_makes_no_request(self, client: GraphQLClient):
+        client.client.post.return_value = _mock_response({"q0_user": {"login": "u"}})
+        await client.execute_batch([(self._Q_USER, {"username": "u"})])
+        await client.execute_batch([(self._Q_USER, {"username": "u"})])
+        assert client.client.post.call_count == 1
+
+
+class TestNodeBudget:
+    """Client-side estimate of GitHub's node-count cost."""
+
+    def test_nested_connections_multiply(self):
+        query = "query { a(first: 10) { nodes { b(first: 20) { nodes { id } } } } c(last: 5) { id } }"
+        assert _estimate_nodes(query) == 10 + 10 * 20 + 5
+
+    def test_page_size_variables_are_resolved(self):
+        query = "query($n: Int) { a(first: $n) { id } }"
+        assert _estimate_nodes(query, {"n": 7}) == 7
+        assert _estimate_nodes(query) == 100
+
+    def test_input_object_braces_are_ignored(self):
+        query = "query { a(first: 10, orderBy: {field: UPDATED_AT, direction: DESC}) { b(first: 2) { id } } }"
+        assert _estimate_nodes(query) == 10 + 20
+
+    def test_alias_named_like_page_size_is_ignored(self):
+        assert _estimate_nodes("query { last: viewer { login } }") == 0
+
+    def test_page_size_text_inside_string_literal_is_ignored(self):
+        query = 'query { search(query: "first: foo", type: ISSUE, first: 5) { nodes { id } } }'
+        assert _estimate_nodes(query) == 5
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "SEARCH_USER_QUERY",
+            "PR_LINKED_ISSUES_QUERY",
+            "PR_STATUS_CHECKS_QUERY",
+            "CHECK_SUITE_RUNS_QUERY",
+            "USER_CONTRIBUTIONS_QUERY",
+        ],
+    )
+    def test_shipped_queries_fit_the_budget(self, name: str):
+        assert _estimate_nodes(getattr(graphql_queries, name)) <= GRAPHQL_MAX_NODES
+
+    @pytest.mark.anyio
+    async def test_oversized_query_rejected_without_request(self, client: GraphQLClient):
+        query = "query { a(first: 100) { b(first: 100) { c(first: 100) { id } } } }"
+        with pytest.raises(GitHubAPIError, match="QUERY_TOO_LARGE"):
+            await client.execute_query(query)
+        client.client.post.assert_not_called()
+
+
+class TestVariableValidation:
+    """Client-side check that required variables are supplied."""
+
+    def test_only_non_null_without_default_are_required(self):
+        query = 'query($a: [String!]! = ["x"], $b: Int!, $c: Int) { x }'
+        assert _required_variables(query) == {"b"}
+
+    @pytest.mark.anyio
+    async def test_missing_variable_rejected_without_request(self, client: GraphQLClient):
+        with pytest.raises(GitHubAPIError, match=r"INVALID_QUERY.*\$number, \$repo"):
+            await client.execute_query(graphql_queries.PR_LINKED_ISSUES_QUERY, {"owner": "o"})
+        client.client.post.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_none_counts_as_missing(self, client: GraphQLClient):
+        with pytest.raises(GitHubAPIError, match="INVALID_QUERY"):
+            await client.execute_query(graphql_queries.SEARCH_USER_QUERY, {"username": None})
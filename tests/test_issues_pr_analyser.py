@@ -0,0 +1,43 @@
+"""Tests for issues_pr_analyser.py — server lifecycle and shared client shutdown."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_github.issues_pr_analyser import PRIssueAnalyser
+
+
+@pytest.fixture
+def analyser() -> PRIssueAnalyser:
+    """PRIssueAnalyser in static-token mode with real, unopened HTTP clients."""
+    with patch("mcp_github.github_integration.GITHUB_TOKEN", "test-token"):
+        return PRIssueAnalyser()
+
+
+class TestClientLifecycle:
+    """The shared HTTP clients outlive sessions and close only when the server stops."""
+
+    @pytest.mark.anyio
+    async def test_lifespan_reentry_keeps_clients_open(self, analyser: PRIssueAnalyser):
+        for _ in range(2):
+            async with analyser.mcp._lifespan_manager():
+                assert not analyser.gi._http.is_closed
+        assert not analyser.gi._http.is_closed
+        assert not analyser.gi.graphql.client.is_closed
+        await analyser.gi.aclose()
+
+    @pytest.mark.anyio
+    async def test_serve_closes_clients_on_exit(self, analyser: PRIssueAnalyser):
+        with patch.object(analyser.mcp, "run_async", AsyncMock()):
+            await analyser._serve()
+        assert analyser.gi._http.is_closed
+        assert analyser.gi.graphql.client.is_closed
+
+    @pytest.mark.anyio
+    async def test_serve_closes_clients_on_failure(self, analyser: PRIssueAnalyser):
+        with (
+            patch.object(analyser.mcp, "run_async", AsyncMock(side_effect=OSError("bind failed"))),
+            pytest.raises(OSError),
+        ):
+            await analyser._serve()
+        assert analyser.gi._http.is_closed